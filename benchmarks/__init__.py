@@ -0,0 +1,5 @@
+# benchmarks/__init__.py
+from .suite import BENCHMARK_MATRIX, QUICK_MATRIX, benchmark_cases, run_case, run_suite
+
+__all__ = ['BENCHMARK_MATRIX', 'QUICK_MATRIX', 'benchmark_cases', 'run_case',
+           'run_suite']
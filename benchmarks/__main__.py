@@ -0,0 +1,27 @@
+import argparse
+
+from .suite import BENCHMARK_MATRIX, QUICK_MATRIX, run_suite
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark steps/second and peak memory across R, T, Rd and protocol.")
+    parser.add_argument('--engine', choices=['mesa', 'vectorized'], default='mesa')
+    parser.add_argument('--quick', action='store_true',
+                        help="run the small development matrix instead of the full one")
+    parser.add_argument('--min-seconds', type=float, default=1.0,
+                        help="time each case for at least this long (after one step)")
+    parser.add_argument('--max-steps', type=int, default=1000)
+    parser.add_argument('--output-dir', default='results/benchmarks')
+    args = parser.parse_args()
+
+    print("=" * 80)
+    print(f"STA benchmark suite ({args.engine} engine)")
+    print("=" * 80)
+    run_suite(QUICK_MATRIX if args.quick else BENCHMARK_MATRIX, engine=args.engine,
+              min_seconds=args.min_seconds, max_steps=args.max_steps,
+              output_dir=args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulation.planner import effective_params
+from simulation.runner import ENGINES, PROTOCOLS, expand_grid, model_params
+
+# Full matrix: R, T, Rd and protocol. Tr, Tc and Rv stay at the assignment values.
+BENCHMARK_MATRIX = {
+    'num_agents': [30, 300, 3000, 30000, 100000],
+    'num_tasks': [1, 10, 100, 1000, 10000],
+    'communication_range': [0, 100, 400, 1400],
+    'protocol': list(PROTOCOLS),
+}
+
+# Small matrix for a quick check while developing
+QUICK_MATRIX = {
+    'num_agents': [30, 300],
+    'num_tasks': [2, 100],
+    'communication_range': [0, 400],
+    'protocol': list(PROTOCOLS),
+}
+
+FIXED_PARAMS = dict(task_radius=50, required_agents_per_task=3, agent_speed=25)
+
+
+def benchmark_cases(matrix=None, engine='mesa'):
+    """Expand a matrix into distinct benchmark cases.
+
+    Cases that simulate the same model (random search at every Rd, any
+    protocol at Rd=0) are kept once.
+    """
+    seen = set()
+    cases = []
+    for config in expand_grid(matrix or BENCHMARK_MATRIX):
+        params = effective_params(ENGINES[engine],
+                                  model_params({**FIXED_PARAMS, **config}))
+        key = tuple(sorted(params.items()))
+        if key not in seen:
+            seen.add(key)
+            cases.append(config)
+    return cases
+
+
+def run_case(job):
+    """Build one model, step it for a while and return steps/second and peak memory.
+
+    Runs in a fresh worker process, so ru_maxrss is the peak resident set
+    of this case alone.
+    """
+    config, engine, warmup_steps, min_seconds, max_steps, seed = job
+    baseline_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    model = ENGINES[engine](seed=seed, store_series=False,
+                            **model_params({**FIXED_PARAMS, **config}))
+    setup_time = time.perf_counter() - start
+
+    for _ in range(warmup_steps):
+        model.step()
+
+    steps = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while steps < max_steps and (steps == 0 or elapsed < min_seconds):
+        model.step()
+        steps += 1
+        elapsed = time.perf_counter() - start
+
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    row = dict(config)
+    row.update({
+        'engine': engine,
+        'steps': steps,
+        'seconds': elapsed,
+        'steps_per_second': steps / elapsed if elapsed > 0 else float('inf'),
+        'setup_seconds': setup_time,
+        'peak_rss_mb': peak_kb / 1024,
+        'model_rss_mb': (peak_kb - baseline_kb) / 1024,
+    })
+    return row
+
+
+def git_revision():
+    """Short commit hash of the working tree, with '-dirty' if it has changes."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'],
+                               cwd=root, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+    return revision + ('-dirty' if dirty else '')
+
+
+def run_suite(matrix=None, engine='mesa', warmup_steps=5, min_seconds=1.0,
+              max_steps=1000, seed=0, output_dir='results/benchmarks',
+              verbose=True):
+    """Benchmark every case of a matrix into <output_dir>/<commit>-<engine>.json.
+
+    Cases run one at a time, each in a freshly spawned process, so timings
+    do not compete for cores and peak memory is per case. Returns the
+    written record.
+    """
+    cases = benchmark_cases(matrix, engine)
+    rows = []
+    context = multiprocessing.get_context('spawn')
+    for index, config in enumerate(cases):
+        job = (config, engine, warmup_steps, min_seconds, max_steps, seed)
+        # One single-use pool per case: a new interpreter for every case
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            row = executor.submit(run_case, job).result()
+        rows.append(row)
+        if verbose:
+            print(f"  [{index + 1}/{len(cases)}] R={config['num_agents']:<6} "
+                  f"T={config['num_tasks']:<5} Rd={config['communication_range']:<4} "
+                  f"{config['protocol']:<8} {row['steps_per_second']:>10.1f} steps/s "
+                  f"{row['peak_rss_mb']:>8.1f} MB")
+
+    revision = git_revision()
+    record = {
+        'commit': revision,
+        'engine': engine,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'fixed_params': FIXED_PARAMS,
+        'settings': {'warmup_steps': warmup_steps, 'min_seconds': min_seconds,
+                     'max_steps': max_steps, 'seed': seed},
+        'results': rows,
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f'{revision}-{engine}.json')
+    with open(path, 'w') as handle:
+        json.dump(record, handle, indent=2)
+    if verbose:
+        print(f"\nResults saved to: {path}")
+    return record
@@ -6,36 +6,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 from models.sta_model import STAModel
 from scipy import stats
-
-def analyze_steady_state(completion_rates, window_size=50):
-    """
-    Analyze when the system reaches steady state.
-    Returns iteration number when coefficient of variation stabilizes.
-    """
-    if len(completion_rates) < window_size * 2:
-        return len(completion_rates)
-    
-    # Calculate rolling statistics
-    cvs = []
-    for i in range(window_size, len(completion_rates) - window_size):
-        window = completion_rates[i-window_size:i+window_size]
-        if np.mean(window) > 0:
-            cv = np.std(window) / np.mean(window)
-            cvs.append(cv)
-    
-    # Find when CV stabilizes (derivative approaches 0)
-    if len(cvs) > 100:
-        # Use moving average of CV
-        cv_smooth = np.convolve(cvs, np.ones(20)/20, mode='valid')
-        # Find when rate of change is small
-        derivative = np.abs(np.diff(cv_smooth))
-        # Steady state when derivative stays below threshold
-        threshold = 0.001
-        for i in range(50, len(derivative)):
-            if np.mean(derivative[i-50:i]) < threshold:
-                return i + window_size
-    
-    return len(completion_rates) // 2
+from simulation import steady_state_index
 
 def calculate_required_runs(data, confidence=0.95, relative_error=0.05):
     """
@@ -119,20 +90,20 @@ def run_part1d():
             )
             
             model.run_model(3000)
-            completion_rates = model.get_completion_rate_over_time()
-            
-            # Analyze steady state
-            steady_iter = analyze_steady_state(completion_rates)
-            results[T]['convergence_iters'].append(steady_iter)
+            results[T]['runs_data'].append(model.get_completion_rate_over_time())
             
-            # Calculate statistics after steady state
+            if (run + 1) % 5 == 0:
+                print(f"  Completed {run+1}/{num_runs_for_testing} runs...")
+        
+        # Analyze steady state of every run at once
+        runs_matrix = np.array(results[T]['runs_data'])
+        results[T]['convergence_iters'] = list(steady_state_index(runs_matrix))
+        
+        # Calculate statistics after steady state
+        for completion_rates, steady_iter in zip(runs_matrix, results[T]['convergence_iters']):
             steady_data = completion_rates[steady_iter:]
-            results[T]['runs_data'].append(completion_rates)
             results[T]['mean_rates'].append(np.mean(steady_data))
             results[T]['std_rates'].append(np.std(steady_data))
-            
-            if (run + 1) % 5 == 0:
-                print(f"  Completed {run+1}/{num_runs_for_testing} runs...")
         
         # Statistical analysis
         avg_steady_iter = np.mean(results[T]['convergence_iters'])
@@ -4,7 +4,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import numpy as np
 import matplotlib.pyplot as plt
-from models.sta_model import STAModel
+from simulation import run_sweep, collect, paired_differences
 
 def run_part2b():
     """
@@ -43,90 +43,36 @@ def run_part2b():
         'auction': {'mean_rates': [], 'std_rates': [], 'all_rates': []}
     }
     
-    # Run all protocols for each Rd
+    # Run every (protocol, Rd, seed) job in parallel. Common random numbers
+    # give every protocol the same agent walks and task positions per seed,
+    # so protocols are compared through per-seed (paired) differences.
+    print(f"\nRunning {len(results) * len(communication_ranges) * num_runs} simulations in parallel...")
+    rows = run_sweep(
+        grid={'protocol': list(results), 'communication_range': communication_ranges},
+        seeds=[500 + run for run in range(num_runs)],
+        num_iterations=num_iterations,
+        warmup_iterations=warmup_iterations,
+        base_params=dict(num_agents=num_agents, num_tasks=num_tasks,
+                         task_radius=task_radius,
+                         required_agents_per_task=required_agents,
+                         agent_speed=agent_speed),
+        cache_dir='results/cache',
+        common_random_numbers=True
+    )
+    run_rates = collect(rows, by=('protocol', 'communication_range'))
+    
+    labels = {'random': 'Random', 'callout': 'Call-Out', 'calloff': 'Call-Off', 'auction': 'Auction'}
     for Rd in communication_ranges:
         print(f"\n{'='*80}")
-        print(f"Testing all protocols at Rd = {Rd}")
+        print(f"Results for all protocols at Rd = {Rd}")
         print(f"{'='*80}")
         
-        # Random
-        print(f"  Running RANDOM...")
-        random_rates = []
-        for run in range(num_runs):
-            model = STAModel(
-                num_agents=num_agents, num_tasks=num_tasks,
-                task_radius=task_radius, required_agents_per_task=required_agents,
-                agent_speed=agent_speed, communication_range=0,
-                use_communication=False, use_auction=False, seed=500 + run
-            )
-            model.run_model(num_iterations)
-            steady_data = model.get_completion_rate_over_time()[warmup_iterations:]
-            random_rates.append(np.mean(steady_data))
-        
-        results['random']['mean_rates'].append(np.mean(random_rates))
-        results['random']['std_rates'].append(np.std(random_rates))
-        results['random']['all_rates'].append(random_rates)
-        print(f"    Random: {results['random']['mean_rates'][-1]:.4f}")
-        
-        # Call-Out
-        print(f"  Running CALL-OUT...")
-        callout_rates = []
-        for run in range(num_runs):
-            model = STAModel(
-                num_agents=num_agents, num_tasks=num_tasks,
-                task_radius=task_radius, required_agents_per_task=required_agents,
-                agent_speed=agent_speed, communication_range=Rd,
-                use_communication=True, use_calloff=False, use_auction=False,
-                seed=500 + run
-            )
-            model.run_model(num_iterations)
-            steady_data = model.get_completion_rate_over_time()[warmup_iterations:]
-            callout_rates.append(np.mean(steady_data))
-        
-        results['callout']['mean_rates'].append(np.mean(callout_rates))
-        results['callout']['std_rates'].append(np.std(callout_rates))
-        results['callout']['all_rates'].append(callout_rates)
-        print(f"    Call-Out: {results['callout']['mean_rates'][-1]:.4f}")
-        
-        # Call-Off
-        print(f"  Running CALL-OFF...")
-        calloff_rates = []
-        for run in range(num_runs):
-            model = STAModel(
-                num_agents=num_agents, num_tasks=num_tasks,
-                task_radius=task_radius, required_agents_per_task=required_agents,
-                agent_speed=agent_speed, communication_range=Rd,
-                use_communication=True, use_calloff=True, use_auction=False,
-                seed=500 + run
-            )
-            model.run_model(num_iterations)
-            steady_data = model.get_completion_rate_over_time()[warmup_iterations:]
-            calloff_rates.append(np.mean(steady_data))
-        
-        results['calloff']['mean_rates'].append(np.mean(calloff_rates))
-        results['calloff']['std_rates'].append(np.std(calloff_rates))
-        results['calloff']['all_rates'].append(calloff_rates)
-        print(f"    Call-Off: {results['calloff']['mean_rates'][-1]:.4f}")
-        
-        # Auction
-        print(f"  Running AUCTION...")
-        auction_rates = []
-        for run in range(num_runs):
-            model = STAModel(
-                num_agents=num_agents, num_tasks=num_tasks,
-                task_radius=task_radius, required_agents_per_task=required_agents,
-                agent_speed=agent_speed, communication_range=Rd,
-                use_communication=False, use_calloff=False, use_auction=True,
-                seed=500 + run
-            )
-            model.run_model(num_iterations)
-            steady_data = model.get_completion_rate_over_time()[warmup_iterations:]
-            auction_rates.append(np.mean(steady_data))
-        
-        results['auction']['mean_rates'].append(np.mean(auction_rates))
-        results['auction']['std_rates'].append(np.std(auction_rates))
-        results['auction']['all_rates'].append(auction_rates)
-        print(f"    Auction: {results['auction']['mean_rates'][-1]:.4f}")
+        for protocol_name, protocol_data in results.items():
+            rates = run_rates[(protocol_name, Rd)]
+            protocol_data['mean_rates'].append(np.mean(rates))
+            protocol_data['std_rates'].append(np.std(rates))
+            protocol_data['all_rates'].append(rates)
+            print(f"    {labels[protocol_name]}: {protocol_data['mean_rates'][-1]:.4f}")
     
     # Convert to numpy arrays
     for protocol in results.values():
@@ -291,6 +237,30 @@ def run_part2b():
               f"{results['auction']['mean_rates'][i]:<12.4f} "
               f"{labels[best_protocol]:<12}")
     
+    # Paired differences (same seed, common random numbers)
+    versus_random = paired_differences(rows, baseline='random')
+    versus_calloff = paired_differences(rows, baseline='calloff')
+    print("\n" + "="*100)
+    print("PAIRED DIFFERENCES (per-seed, common random numbers, mean ± 95% CI):")
+    print("="*100)
+    print(f"{'Rd':<8} {'Call-Out - Random':<22} {'Call-Off - Random':<22} "
+          f"{'Auction - Random':<22} {'Auction - Call-Off':<22}")
+    print("-" * 100)
+    ratios = []
+    for Rd in communication_ranges:
+        cells = [versus_random[(Rd, name)] for name in ('callout', 'calloff', 'auction')]
+        cells.append(versus_calloff[(Rd, 'auction')])
+        print(f"{Rd:<8} " + " ".join(
+            f"{cell['mean_difference']:+.4f} ± {cell['ci_half_width']:.4f}".ljust(22)
+            for cell in cells))
+        # At Rd=0 every protocol is random search, so the pairs are identical runs
+        if Rd > 0:
+            ratios += [cell['variance_ratio'] for cell in cells
+                       if np.isfinite(cell['variance_ratio'])]
+    if ratios:
+        print(f"\nMedian var(difference) / (var(a) + var(b)) over the pairs above with Rd > 0: "
+              f"{np.median(ratios):.2f} (1.00 for independent runs)")
+    
     # Detailed findings
     print("\n" + "="*100)
     print("DETAILED FINDINGS:")
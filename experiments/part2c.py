@@ -4,7 +4,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import numpy as np
 import matplotlib.pyplot as plt
-from models.sta_model import STAModel
+from simulation import run_until_precise
 
 def calculate_cost_adjusted_performance(model_results, Tc):
     """
@@ -47,7 +47,8 @@ def run_part2c():
     agent_speed = 25
     num_iterations = 2000
     warmup_iterations = 1000
-    num_runs = 20
+    max_runs = 20  # Runs stop earlier once the 95% CI is within 5% of the mean
+    target_relative_error = 0.05
     
     print(f"\nCost Model:")
     print(f"  Strategic Agent (Auctioneer): Cost = 2 units")
@@ -70,63 +71,31 @@ def run_part2c():
         'auction': {'mean_rates': [], 'std_rates': []}
     }
     
+    precision = run_until_precise(
+        grid={'protocol': list(results), 'communication_range': communication_ranges},
+        first_seed=600,
+        num_iterations=num_iterations,
+        warmup_iterations=warmup_iterations,
+        base_params=dict(num_agents=num_agents, num_tasks=num_tasks,
+                         task_radius=task_radius,
+                         required_agents_per_task=required_agents,
+                         agent_speed=agent_speed),
+        target_relative_error=target_relative_error,
+        max_runs=max_runs,
+        cache_dir='results/cache'
+    )
+    by_config = {(entry['protocol'], entry['communication_range']): entry
+                 for entry in precision}
+    
+    labels = {'callout': 'Call-Out', 'calloff': 'Call-Off', 'auction': 'Auction'}
     for Rd in communication_ranges:
-        print(f"\nTesting Rd = {Rd}...")
-        
-        # Call-Out
-        callout_rates = []
-        for run in range(num_runs):
-            model = STAModel(
-                num_agents=num_agents, num_tasks=num_tasks,
-                task_radius=task_radius, required_agents_per_task=required_agents,
-                agent_speed=agent_speed, communication_range=Rd,
-                use_communication=True, use_calloff=False, use_auction=False,
-                seed=600 + run
-            )
-            model.run_model(num_iterations)
-            steady_data = model.get_completion_rate_over_time()[warmup_iterations:]
-            callout_rates.append(np.mean(steady_data))
-        
-        results['callout']['mean_rates'].append(np.mean(callout_rates))
-        results['callout']['std_rates'].append(np.std(callout_rates))
-        
-        # Call-Off
-        calloff_rates = []
-        for run in range(num_runs):
-            model = STAModel(
-                num_agents=num_agents, num_tasks=num_tasks,
-                task_radius=task_radius, required_agents_per_task=required_agents,
-                agent_speed=agent_speed, communication_range=Rd,
-                use_communication=True, use_calloff=True, use_auction=False,
-                seed=600 + run
-            )
-            model.run_model(num_iterations)
-            steady_data = model.get_completion_rate_over_time()[warmup_iterations:]
-            calloff_rates.append(np.mean(steady_data))
-        
-        results['calloff']['mean_rates'].append(np.mean(calloff_rates))
-        results['calloff']['std_rates'].append(np.std(calloff_rates))
-        
-        # Auction
-        auction_rates = []
-        for run in range(num_runs):
-            model = STAModel(
-                num_agents=num_agents, num_tasks=num_tasks,
-                task_radius=task_radius, required_agents_per_task=required_agents,
-                agent_speed=agent_speed, communication_range=Rd,
-                use_communication=False, use_calloff=False, use_auction=True,
-                seed=600 + run
-            )
-            model.run_model(num_iterations)
-            steady_data = model.get_completion_rate_over_time()[warmup_iterations:]
-            auction_rates.append(np.mean(steady_data))
-        
-        results['auction']['mean_rates'].append(np.mean(auction_rates))
-        results['auction']['std_rates'].append(np.std(auction_rates))
-        
-        print(f"  Call-Out: {results['callout']['mean_rates'][-1]:.4f}")
-        print(f"  Call-Off: {results['calloff']['mean_rates'][-1]:.4f}")
-        print(f"  Auction:  {results['auction']['mean_rates'][-1]:.4f}")
+        print(f"\nRd = {Rd}:")
+        for protocol_name, protocol_data in results.items():
+            entry = by_config[(protocol_name, Rd)]
+            protocol_data['mean_rates'].append(entry['mean_rate'])
+            protocol_data['std_rates'].append(np.std(entry['rates']))
+            print(f"  {labels[protocol_name] + ':':<10}{entry['mean_rate']:.4f} "
+                  f"({entry['runs']} runs, ±{100 * entry['relative_error']:.1f}%)")
     
     # Convert to numpy arrays
     for protocol in results.values():
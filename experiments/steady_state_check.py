@@ -0,0 +1,63 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from simulation import steady_state_index
+
+
+def analyze_steady_state(completion_rates, window_size=50):
+    """The original part1d loop that steady_state_index replaces (reference)."""
+    if len(completion_rates) < window_size * 2:
+        return len(completion_rates)
+    
+    cvs = []
+    for i in range(window_size, len(completion_rates) - window_size):
+        window = completion_rates[i-window_size:i+window_size]
+        if np.mean(window) > 0:
+            cvs.append(np.std(window) / np.mean(window))
+    
+    if len(cvs) > 100:
+        cv_smooth = np.convolve(cvs, np.ones(20)/20, mode='valid')
+        derivative = np.abs(np.diff(cv_smooth))
+        for i in range(50, len(derivative)):
+            if np.mean(derivative[i-50:i]) < 0.001:
+                return i + window_size
+    
+    return len(completion_rates) // 2
+
+
+def run_steady_state_check(seed=0):
+    """
+    Check steady_state_index against the original loop, index for index
+    - Lengths 50..2000, completion probabilities from 0.001 to 0.5
+    - Each length/probability pair is checked as one (runs, iterations) matrix
+    """
+    
+    print("=" * 80)
+    print("Vectorised steady-state detection vs original part1d loop")
+    print("=" * 80)
+    
+    rng = np.random.default_rng(seed)
+    lengths = [50, 99, 100, 101, 150, 190, 200, 201, 220, 250, 300, 500, 1000, 2000]
+    probabilities = [0.001, 0.005, 0.02, 0.05, 0.1, 0.3, 0.5]
+    runs = 12
+    
+    checked = mismatches = 0
+    for length in lengths:
+        for probability in probabilities:
+            series = rng.binomial(2, probability, (runs, length)).astype(float)
+            fast = steady_state_index(series)
+            for run in range(runs):
+                expected = analyze_steady_state(series[run])
+                checked += 1
+                if fast[run] != expected:
+                    mismatches += 1
+                    print(f"  n={length} p={probability}: loop {expected}, "
+                          f"vectorised {fast[run]}")
+    
+    print(f"\n{mismatches}/{checked} series differ")
+    return mismatches
+
+if __name__ == "__main__":
+    sys.exit(1 if run_steady_state_check() else 0)
@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from models import STAModel
+from simulation import confidence_interval
+from simulation.runner import model_params, run_jobs
+
+# (script, first seed, protocols) of the part1e/1f/2a replication loops
+SCRIPTS = [
+    ('part1e', 200, ['callout']),
+    ('part1f', 300, ['callout', 'calloff']),
+    ('part2a', 400, ['auction']),
+]
+
+
+def run_pair(job):
+    """Detected and fixed-warm-up estimates of one run (same seed, same trajectory)."""
+    params, seed, num_iterations, steady_iterations, warmup_iterations = job
+    model = STAModel(seed=seed, **params)
+    model.run_model(num_iterations, steady_iterations=steady_iterations)
+    stopped = len(model.get_completion_rate_over_time())
+    detected = model.get_steady_state_rate()[0]
+    # Detection does not alter the trajectory, so finish the fixed-length run
+    model.run_model(num_iterations - stopped)
+    series = model.get_completion_rate_over_time()
+    return detected, model.warmup_point, stopped, float(np.mean(series[warmup_iterations:]))
+
+
+def run_warmup_check():
+    """
+    Check MSER warm-up detection against the fixed 1000-iteration warm-up
+    - part1e/1f/2a configurations and seeds, 20 runs of up to 2000 iterations
+    - Each run is scored both ways; per-seed differences give a paired 95% CI
+    """
+
+    print("=" * 80)
+    print("Detected (MSER) vs fixed 1000-iteration warm-up (Part 1(e), 1(f), 2(a))")
+    print("=" * 80)
+
+    communication_ranges = [100, 200, 300, 400, 600, 1000, 1400]  # Rd=0 is random
+    num_iterations = 2000
+    steady_iterations = 1000
+    warmup_iterations = 1000
+    num_runs = 20
+    base_params = dict(num_agents=30, num_tasks=2, task_radius=50,
+                       required_agents_per_task=3, agent_speed=25)
+
+    configs = [(script, first_seed, 'random', 0) for script, first_seed, _ in SCRIPTS]
+    configs += [(script, first_seed, protocol, Rd) for script, first_seed, protocols in SCRIPTS
+                for protocol in protocols for Rd in communication_ranges]
+    jobs = [(model_params({**base_params, 'protocol': protocol, 'communication_range': Rd}),
+             first_seed + run, num_iterations, steady_iterations, warmup_iterations)
+            for _, first_seed, protocol, Rd in configs for run in range(num_runs)]
+    results = run_jobs(run_pair, jobs)
+
+    print(f"\n{'Script':<8}{'Protocol':<10}{'Rd':>6}{'Fixed':>10}{'Detected':>10}"
+          f"{'Difference':>22}{'Warm-up':>9}{'Iters':>7}")
+    disagreeing = 0
+    for position, (script, _, protocol, Rd) in enumerate(configs):
+        detected, warmups, stops, fixed = np.array(
+            results[position * num_runs:(position + 1) * num_runs]).T
+        difference, half_width = confidence_interval(detected - fixed)
+        agree = abs(difference) <= half_width
+        disagreeing += not agree
+        print(f"{script:<8}{protocol:<10}{Rd:>6}{fixed.mean():>10.4f}{detected.mean():>10.4f}"
+              f"{f'{difference:+.4f} ± {half_width:.4f}':>20}{'' if agree else ' *':<2}"
+              f"{np.median(warmups):>9.0f}{stops.mean():>7.0f}")
+
+    print(f"\n{disagreeing}/{len(configs)} configurations differ from the fixed warm-up "
+          f"(* = paired 95% CI excludes 0)")
+    print("Warm-up: median detected warm-up; Iters: mean iterations simulated with detection")
+    return disagreeing
+
+if __name__ == "__main__":
+    run_warmup_check()
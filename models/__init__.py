@@ -2,8 +2,20 @@
 from .sta_model import STAModel
 from .agent import STAAgent
 from .task import Task
+from .vectorized_model import VectorizedSTAModel, BatchedSTAModel, run_replicas
+from .stats import CompletionStats, completion_batch_size, mser_truncation
+from .profiling import PhaseProfiler, LatencyHistogram, OperationCounters
+from .snapshot import save_snapshot, load_snapshot
+from .rng import CounterRNG, spawn_generators
+from .replay import ReplayRecorder
+from .protocols import Protocol, CallOut, CallOff, Auction, protocols_from_flags
 
-__all__ = ['STAModel', 'STAAgent', 'Task']
+__all__ = ['STAModel', 'STAAgent', 'Task', 'VectorizedSTAModel',
+           'BatchedSTAModel', 'run_replicas', 'CompletionStats',
+           'completion_batch_size', 'mser_truncation', 'PhaseProfiler', 'LatencyHistogram',
+           'OperationCounters', 'save_snapshot', 'load_snapshot',
+           'CounterRNG', 'spawn_generators', 'ReplayRecorder', 'Protocol',
+           'CallOut', 'CallOff', 'Auction', 'protocols_from_flags']
 
 
 # experiments/__init__.py
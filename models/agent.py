@@ -1,6 +1,10 @@
 import mesa
 import numpy as np
 
+# Agent modes; the index is the code stored in STAModel.modes
+MODES = ("searching", "waiting", "responding")
+MODE_CODES = {mode: code for code, mode in enumerate(MODES)}
+
 class STAAgent(mesa.Agent):
     """An agent that searches for and completes tasks."""
     
@@ -14,31 +18,60 @@ class STAAgent(mesa.Agent):
         
         # Communication protocol variables
         self.target_task = None  # Task agent is responding to
+        self.target_generation = None  # Generation of target_task when signalled
         self.response_timer = 0  # Iterations remaining in response mode
         self.discovered_task = False  # Did this agent discover the task via free search?
-        
-        # Auction variables
-        self.current_bid = None  # Current bid in auction
-        self.auction_task = None  # Task being auctioned
+    
+    @property
+    def mode(self):
+        """Current mode: searching, waiting or responding."""
+        return self._mode
+    
+    @mode.setter
+    def mode(self, mode):
+        # Keep the model's per-mode index sets and mode array in sync
+        agents_by_mode = self.model.agents_by_mode
+        if hasattr(self, '_mode'):
+            agents_by_mode[self._mode].discard(self.unique_id)
+        agents_by_mode[mode].add(self.unique_id)
+        self.model.modes[self.unique_id] = MODE_CODES[mode]
+        self._mode = mode
+    
+    @property
+    def response_timer(self):
+        """Iterations remaining in response mode (stored in model.response_timers)."""
+        return self.model.response_timers[self.unique_id]
+    
+    @response_timer.setter
+    def response_timer(self, value):
+        self.model.response_timers[self.unique_id] = value
         
     def step(self):
         """Execute one step of agent behavior."""
+        profiler = self.model.profiler
         if self.mode == "searching":
-            self.random_move()
-            self.check_for_tasks()
+            if profiler is None:
+                self.random_move()
+                self.check_for_tasks()
+            else:
+                profiler.time("movement", self.random_move)
+                profiler.time("detection", self.check_for_tasks)
         elif self.mode == "waiting":
             # Agent is at a task, waiting for it to complete
             pass
         elif self.mode == "responding":
-            self.respond_to_signal()
+            if profiler is None:
+                self.respond_to_signal()
+            else:
+                profiler.time("response", self.respond_to_signal)
     
     def random_move(self):
         """Move randomly within speed limit using uniform random walk."""
-        # Generate random angle
-        angle = self.random.uniform(0, 2 * np.pi)
-        
-        # Generate random distance (uniform within circle)
-        distance = self.random.uniform(0, self.speed)
+        # Random angle and distance (uniform within circle), drawn in blocks
+        # by the model
+        u, v = self.model.walk_draw(self)
+        angle = 2 * np.pi * u
+        distance = self.speed * v
         
         # Calculate new position
         new_x = self.pos[0] + distance * np.cos(angle)
@@ -48,90 +81,34 @@ class STAAgent(mesa.Agent):
         new_x = np.clip(new_x, 0, 1000)
         new_y = np.clip(new_y, 0, 1000)
         
-        self.pos = (new_x, new_y)
+        self.move_to((new_x, new_y))
+    
+    def move_to(self, pos):
+        """Set the agent's position and keep the model's agent grid and positions in sync."""
+        self.pos = pos
+        self.model.positions[self.unique_id] = pos
+        self.model.agent_grid.move(self, pos)
     
     def check_for_tasks(self):
         """Check if agent is within range of any tasks."""
-        for task in self.model.tasks:
+        # Only tasks in this agent's grid cell and its neighbours can be in range
+        for task in self.model.task_grid.query(self.pos):
             if task.is_within_range(self.pos):
                 self.current_task = task
                 self.mode = "waiting"
                 # Mark if this agent discovered the task via free search
                 self.discovered_task = (self.mode != "responding")
-                task.add_agent(self)
+                self.model.add_agent_to_task(task, self)
                 
-                # Handle based on protocol
-                if self.model.use_auction and self.discovered_task:
-                    # Auction protocol: become auctioneer
-                    self.conduct_auction(task)
-                elif self.model.use_communication and self.discovered_task:
-                    # Swarm protocol: emit call-out signal
-                    self.emit_callout_signal(task)
+                # Protocols see every discovery once all agents have moved
+                if self.discovered_task and self.model.protocols:
+                    self.model.report_discovery(self, task)
                 return
     
-    def conduct_auction(self, task):
-        """Conduct an auction for the discovered task."""
-        if self.model.communication_range <= 0:
-            return
-        
-        # This agent is the auctioneer
-        bidders = []
-        
-        # Find agents within communication range who can bid
-        for agent in self.model.agents:
-            if agent.unique_id == self.unique_id:
-                continue
-            
-            distance = self.distance_to(agent.pos)
-            if distance <= self.model.communication_range:
-                # Agent can participate if in searching mode
-                if agent.mode == "searching":
-                    # Agent bids with their distance to the auctioneer
-                    bid = {
-                        'agent': agent,
-                        'distance': distance
-                    }
-                    bidders.append(bid)
-        
-        # Sort bidders by distance (lower is better)
-        bidders.sort(key=lambda b: b['distance'])
-        
-        # Recruit the closest (Tc - 1) agents (auctioneer already at task)
-        needed = self.model.required_agents_per_task - 1
-        winners = bidders[:needed]
-        
-        # Assign winners to move toward task
-        for winner in winners:
-            agent = winner['agent']
-            agent.mode = "responding"
-            agent.target_task = task
-            agent.response_timer = self.model.response_duration if hasattr(self.model, 'response_duration') else 60
-    
-    def emit_callout_signal(self, task):
-        """Emit a call-out signal to nearby agents."""
-        if self.model.communication_range <= 0:
-            return
-            
-        # Find agents within communication range
-        for agent in self.model.agents:
-            if agent.unique_id == self.unique_id:
-                continue
-            
-            distance = self.distance_to(agent.pos)
-            if distance <= self.model.communication_range:
-                # Agent receives signal if in searching mode
-                if agent.mode == "searching":
-                    agent.receive_callout_signal(task)
-    
-    def receive_callout_signal(self, task):
-        """Receive a call-out signal and start responding."""
-        self.mode = "responding"
-        self.target_task = task
-        self.response_timer = self.model.response_duration
-    
     def respond_to_signal(self):
         """Move toward the target task in response to signal."""
-        if self.target_task is None or self.target_task not in self.model.tasks:
+        if self.target_task is None or not self.model.is_current(
+                self.target_task, self.target_generation):
             # Task no longer exists or invalid
             self.release()
             return
@@ -144,8 +121,8 @@ class STAAgent(mesa.Agent):
             self.current_task = self.target_task
             self.mode = "waiting"
             self.discovered_task = False  # Responding agent, not discoverer
-            self.target_task.add_agent(self)
-            self.target_task = None
+            self.model.add_agent_to_task(self.target_task, self)
+            self.set_target(None)
             return
         
         # If timer expires, return to searching
@@ -162,6 +139,7 @@ class STAAgent(mesa.Agent):
         dx = task.pos[0] - self.pos[0]
         dy = task.pos[1] - self.pos[1]
         distance = np.sqrt(dx**2 + dy**2)
+        self.model.counters.distance_evaluations += 1
         
         if distance == 0:
             return
@@ -175,22 +153,38 @@ class STAAgent(mesa.Agent):
         new_x = np.clip(new_x, 0, 1000)
         new_y = np.clip(new_y, 0, 1000)
         
-        self.pos = (new_x, new_y)
+        self.move_to((new_x, new_y))
     
-    def receive_calloff_signal(self):
-        """Receive a call-off signal and return to searching."""
-        if self.mode == "responding" and self.target_task is not None:
-            # Release from responding mode
-            self.release()
+    def set_target(self, task):
+        """Set (or clear, with None) the task this agent is responding to.
+        
+        Keeps the model's targets and target_generations arrays and its
+        responders index in sync.
+        """
+        responders = self.model.responders
+        if self.target_task is not None:
+            key = (self.target_task.task_id, self.target_generation)
+            heading = responders[key]
+            del heading[self.unique_id]
+            if not heading:
+                del responders[key]
+        if task is not None:
+            responders.setdefault((task.task_id, task.generation), {})[self.unique_id] = None
+        self.target_task = task
+        self.target_generation = None if task is None else task.generation
+        self.model.targets[self.unique_id] = -1 if task is None else task.task_id
+        self.model.target_generations[self.unique_id] = (
+            -1 if task is None else task.generation)
     
     def release(self):
         """Release agent back to searching mode."""
         self.mode = "searching"
         self.current_task = None
-        self.target_task = None
+        self.set_target(None)
         self.response_timer = 0
         self.discovered_task = False
     
     def distance_to(self, pos):
         """Calculate Euclidean distance to a position."""
+        self.model.counters.distance_evaluations += 1
         return np.sqrt((self.pos[0] - pos[0])**2 + (self.pos[1] - pos[1])**2)
\ No newline at end of file
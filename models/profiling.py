@@ -0,0 +1,161 @@
+import time
+
+import numpy as np
+
+
+class PhaseProfiler:
+    """Cumulative wall time and call counts per named phase of a model step."""
+
+    def __init__(self):
+        self.total_time = {}  # phase -> seconds
+        self.calls = {}  # phase -> number of timed calls
+
+    def time(self, phase, function, *args):
+        """Call function(*args), charging its wall time to phase, and return its result."""
+        start = time.perf_counter()
+        result = function(*args)
+        self.add(phase, time.perf_counter() - start)
+        return result
+
+    def add(self, phase, seconds):
+        """Charge an already measured duration to a phase."""
+        self.total_time[phase] = self.total_time.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    def reset(self):
+        """Forget all recorded timings."""
+        self.total_time.clear()
+        self.calls.clear()
+
+    def report(self, print_table=True):
+        """Summarise the phases, slowest first.
+
+        Returns a list of dicts with the phase, its call count, total and
+        mean time, and its share of the 'step' phase (whole steps). With
+        print_table, also prints them as a table.
+        """
+        step_time = self.total_time.get('step', 0.0)
+        rows = []
+        for phase, seconds in sorted(self.total_time.items(),
+                                     key=lambda item: -item[1]):
+            calls = self.calls[phase]
+            rows.append({
+                'phase': phase,
+                'calls': calls,
+                'total_s': seconds,
+                'mean_us': 1e6 * seconds / calls,
+                'share': seconds / step_time if step_time else 0.0,
+            })
+
+        if print_table:
+            print(f"{'Phase':<14}{'Calls':>10}{'Total (s)':>12}{'Mean (us)':>12}{'% of step':>11}")
+            for row in rows:
+                print(f"{row['phase']:<14}{row['calls']:>10}{row['total_s']:>12.4f}"
+                      f"{row['mean_us']:>12.2f}{100 * row['share']:>10.1f}%")
+        return rows
+
+
+class LatencyHistogram:
+    """Fixed-bucket (HDR-style) histogram of durations with bounded memory.
+
+    Durations are recorded in nanoseconds. Values below 2**precision_bits ns
+    get one bucket each; above that every power-of-two range is split into
+    2**(precision_bits - 1) equal buckets, so each bucket is within
+    2**(1 - precision_bits) of its values (about 3% at the default 6 bits).
+    Values above max_seconds are clamped into the last bucket.
+    """
+
+    def __init__(self, precision_bits=6, max_seconds=1000.0):
+        self.precision_bits = precision_bits
+        self.max_seconds = max_seconds
+        self._half = 1 << (precision_bits - 1)
+        self._max_ns = int(max_seconds * 1e9)
+        self.counts = np.zeros(self._index(self._max_ns) + 1, dtype=np.int64)
+        self.total = 0
+        self.sum_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+
+    def _index(self, ns):
+        """Bucket index of a duration in nanoseconds."""
+        shift = ns.bit_length() - self.precision_bits
+        if shift <= 0:
+            return ns
+        return shift * self._half + (ns >> shift)
+
+    def _bucket_value(self, index):
+        """Midpoint (in ns) of the values falling into a bucket."""
+        if index < 2 * self._half:
+            return float(index)
+        shift = index // self._half - 1
+        mantissa = index - shift * self._half
+        return (mantissa + 0.5) * (1 << shift)
+
+    def record(self, seconds):
+        """Add one duration."""
+        ns = min(max(int(seconds * 1e9), 0), self._max_ns)
+        self.counts[self._index(ns)] += 1
+        self.total += 1
+        self.sum_ns += ns
+        self.min_ns = ns if self.min_ns is None else min(self.min_ns, ns)
+        self.max_ns = max(self.max_ns, ns)
+
+    def merge(self, other):
+        """Add another histogram's counts (same bucket layout) into this one."""
+        if (other.precision_bits, other.max_seconds) != (self.precision_bits, self.max_seconds):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        self.counts += other.counts
+        self.total += other.total
+        self.sum_ns += other.sum_ns
+        if other.min_ns is not None:
+            self.min_ns = other.min_ns if self.min_ns is None else min(self.min_ns, other.min_ns)
+        self.max_ns = max(self.max_ns, other.max_ns)
+        return self
+
+    @classmethod
+    def merged(cls, histograms):
+        """Combine several histograms (e.g. one per replica) into a new one."""
+        histograms = list(histograms)
+        result = cls(histograms[0].precision_bits, histograms[0].max_seconds)
+        for histogram in histograms:
+            result.merge(histogram)
+        return result
+
+    def percentile(self, q):
+        """Duration (seconds) below which q percent of the recorded values fall."""
+        if self.total == 0:
+            return 0.0
+        rank = max(1, int(np.ceil(q / 100 * self.total)))
+        index = int(np.searchsorted(np.cumsum(self.counts), rank))
+        value = min(max(self._bucket_value(index), self.min_ns), self.max_ns)
+        return value / 1e9
+
+    def summary(self, percentiles=(50, 90, 99, 99.9)):
+        """Count, mean, min, max and the given percentiles, in seconds."""
+        result = {
+            'count': self.total,
+            'mean': self.sum_ns / self.total / 1e9 if self.total else 0.0,
+            'min': (self.min_ns or 0) / 1e9,
+            'max': self.max_ns / 1e9,
+        }
+        for q in percentiles:
+            result[f'p{q:g}'] = self.percentile(q)
+        return result
+
+
+class OperationCounters:
+    """Machine-independent counts of the work done on the model's hot paths."""
+
+    FIELDS = ('distance_evaluations', 'callout_signals_sent',
+              'callout_signals_received', 'auctions_held',
+              'bidders_considered', 'calloffs_sent', 'calloffs_received',
+              'respawns')
+    __slots__ = FIELDS
+
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+
+    def as_dict(self):
+        """Current counts as a plain dict."""
+        return {name: getattr(self, name) for name in self.FIELDS}
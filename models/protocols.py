@@ -0,0 +1,131 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from .agent import MODE_CODES
+
+SEARCHING = MODE_CODES["searching"]
+
+
+class Protocol:
+    """Coordination strategy plugged into STAModel through batched hooks.
+
+    Hooks see the model's agent arrays, indexed by agent id and kept in sync
+    by STAAgent: ``positions`` (R, 2), ``modes`` (R,) codes from MODE_CODES,
+    ``targets`` / ``target_generations`` (R,) task id and generation each
+    responder is heading to (-1 when none) and ``response_timers`` (R,).
+    ``responders`` maps (task id, generation) to the ids of the agents
+    heading there, as dict keys in recruitment order. ``task_positions``
+    (T, 2) holds every slot's current position. Hooks act
+    on agents through ``model.recruit_agents`` and ``model.release_agents``.
+    Every hook is optional.
+    """
+
+    def on_step(self, model):
+        """Called once at the start of every step, before any agent acts."""
+
+    def on_discovery(self, model, agents, tasks):
+        """Called once per step, after all agents moved, with the agents that
+        discovered a task by searching and the tasks they found (int arrays,
+        in discovery order)."""
+
+    def on_completion(self, model, tasks):
+        """Called once per step with the task ids completed in it (in
+        completion order), after their agents were released and before the
+        slots respawn, so task_positions and generations are still theirs."""
+
+
+class CallOut(Protocol):
+    """Discoverers signal every searching agent within Rd to come and help."""
+
+    def on_discovery(self, model, agents, tasks):
+        if model.communication_range <= 0:
+            return
+        searching = np.flatnonzero(model.modes == SEARCHING)
+        if searching.size == 0:
+            return
+
+        # One KD-tree of searching agents answers every discoverer's query;
+        # agents recruited by an earlier discoverer are skipped by later ones
+        tree = cKDTree(model.positions[searching])
+        neighbours = tree.query_ball_point(model.positions[agents],
+                                           r=model.communication_range)
+        counters = model.counters
+        for task, found in zip(tasks, neighbours):
+            counters.callout_signals_sent += 1
+            candidates = searching[found]
+            recruits = candidates[model.modes[candidates] == SEARCHING]
+            counters.callout_signals_received += recruits.size
+            model.recruit_agents(recruits, task)
+
+
+class Auction(Protocol):
+    """Discoverers recruit the (Tc - 1) closest searching agents within Rd."""
+
+    def on_discovery(self, model, agents, tasks):
+        if model.communication_range <= 0:
+            return
+        searching = np.flatnonzero(model.modes == SEARCHING)
+        needed = model.required_agents_per_task - 1
+        # Earlier auctions take at most (Tc - 1) agents each, so this many
+        # nearest candidates always covers every auction
+        k = min(searching.size, needed * len(agents))
+        if k == 0:
+            return
+
+        tree = cKDTree(model.positions[searching])
+        # distance_upper_bound is exclusive, Rd is inclusive
+        bound = np.nextafter(model.communication_range, np.inf)
+        _, indices = tree.query(model.positions[agents], k=k,
+                                distance_upper_bound=bound)
+        indices = np.reshape(indices, (len(agents), k))
+        counters = model.counters
+        for task, row in zip(tasks, indices):
+            bidders = searching[row[row < searching.size]]
+            counters.auctions_held += 1
+            counters.bidders_considered += bidders.size
+            winners = bidders[model.modes[bidders] == SEARCHING][:needed]
+            model.recruit_agents(winners, task)
+
+
+class CallOff(Protocol):
+    """Completed tasks release the agents still responding to them within Rd."""
+
+    def on_completion(self, model, tasks):
+        if model.communication_range <= 0:
+            return
+        counters = model.counters
+        counters.calloffs_sent += len(tasks)
+
+        # Only the agents indexed under each completed generation can be
+        # heading to it
+        heading = [(agent, task) for task in tasks
+                   for agent in model.responders.get((task, model.tasks[task].generation), ())]
+        if not heading:
+            return
+        responders, targets = np.array(heading, dtype=np.int64).T
+        order = np.argsort(responders, kind='stable')
+        responders, targets = responders[order], targets[order]
+        counters.distance_evaluations += responders.size
+
+        offset = model.positions[responders] - model.task_positions[targets]
+        distance = np.sqrt(offset[:, 0]**2 + offset[:, 1]**2)
+        called_off = responders[distance <= model.communication_range]
+        counters.calloffs_received += called_off.size
+        model.release_agents(called_off)
+
+
+def protocols_from_flags(use_communication=False, use_calloff=False,
+                         use_auction=False):
+    """Protocol instances matching STAModel's use_* flags.
+
+    Auction takes precedence over call-out for recruitment; call-off needs
+    call-out signalling but also runs alongside an auction.
+    """
+    protocols = []
+    if use_auction:
+        protocols.append(Auction())
+    elif use_communication:
+        protocols.append(CallOut())
+    if use_communication and use_calloff:
+        protocols.append(CallOff())
+    return protocols
@@ -0,0 +1,77 @@
+import numpy as np
+
+from .snapshot import load_snapshot, save_snapshot
+
+
+class ReplayRecorder:
+    """Periodic checkpoints and a completion log of a run, for replaying any step.
+
+    Every ``checkpoint_interval`` steps the model's snapshot (without its
+    completion series) is kept, and every completed task is logged as
+    (step, task_id, generation, x, y). ``replay(step)`` restores the nearest
+    earlier checkpoint and re-simulates at most ``checkpoint_interval - 1``
+    steps, reproducing the original run exactly. With rng="counter" the walk
+    draws of any step are also a pure function of (seed, step, agent).
+    """
+
+    def __init__(self, model, checkpoint_interval=1000):
+        self.model = model
+        self.model_class = type(model)
+        self.checkpoint_interval = checkpoint_interval
+        self.checkpoints = {}  # step -> snapshot
+        if model.completion_log is None:
+            model.completion_log = []
+        self.log = model.completion_log
+
+    def checkpoint(self):
+        """Keep a snapshot of the model's current step."""
+        state = self.model.snapshot()
+        state.pop('series', None)
+        self.checkpoints[self.model.steps] = state
+
+    def run(self, num_iterations):
+        """Step the model, checkpointing every checkpoint_interval steps."""
+        for _ in range(num_iterations):
+            if self.model.steps % self.checkpoint_interval == 0:
+                self.checkpoint()
+            self.model.step()
+
+    @property
+    def events(self):
+        """Completion log as an (events, 5) array of step, task_id, generation, x, y."""
+        return np.array(self.log, dtype=float).reshape(-1, 5)
+
+    def replay(self, step, **restore_options):
+        """A model in the state reached after ``step`` steps of the recorded run.
+
+        restore_options go to restore (e.g. store_series=False, profile=True).
+        """
+        start = max((checkpoint for checkpoint in self.checkpoints if checkpoint <= step),
+                    default=None)
+        if start is None:
+            raise ValueError(f"No checkpoint at or before step {step}")
+        model = self.model_class.restore(self.checkpoints[start], **restore_options)
+        model.run_model(step - start)
+        return model
+
+    def save(self, path):
+        """Write every checkpoint and the completion log to one compressed .npz file."""
+        arrays = {'checkpoint_interval': self.checkpoint_interval, 'events': self.events}
+        for step, state in self.checkpoints.items():
+            arrays.update({f'{step}/{name}': value for name, value in state.items()})
+        save_snapshot(arrays, path)
+
+    @classmethod
+    def load(cls, path, model_class):
+        """Read a recording written by save; it can replay but not record further."""
+        arrays = load_snapshot(path)
+        recorder = cls.__new__(cls)
+        recorder.model = None
+        recorder.model_class = model_class
+        recorder.checkpoint_interval = arrays.pop('checkpoint_interval')
+        recorder.log = arrays.pop('events').tolist()
+        recorder.checkpoints = {}
+        for key, value in arrays.items():
+            step, name = key.split('/', 1)
+            recorder.checkpoints.setdefault(int(step), {})[name] = value
+        return recorder
@@ -0,0 +1,42 @@
+import numpy as np
+
+
+def seed_sequence(seed):
+    """SeedSequence for a seed given as None (OS entropy), an int or a SeedSequence."""
+    if isinstance(seed, np.random.SeedSequence):
+        return seed
+    return np.random.SeedSequence(seed)
+
+
+def spawn_generators(seed, count):
+    """``count`` statistically independent PCG64 Generators spawned from one seed.
+
+    Each model draws from its own streams rather than NumPy's global state,
+    so runs in parallel workers never share or disturb each other's draws.
+    """
+    return [np.random.Generator(np.random.PCG64(child))
+            for child in seed_sequence(seed).spawn(count)]
+
+
+class CounterRNG:
+    """Counter-based (Philox) random numbers addressed by position, not by sequence.
+
+    ``block(stream, index, shape, sub)`` returns uniform [0, 1) draws that
+    depend only on the key and the address, so e.g. the random-walk draws
+    of step 1,734,000 can be recomputed without generating anything before
+    them. ``stream`` separates kinds of draws (WALK, TASK, PLACEMENT).
+    """
+
+    WALK = 0
+    TASK = 1
+    PLACEMENT = 2
+
+    def __init__(self, seed=None, key=None):
+        if key is None:
+            key = seed_sequence(seed).generate_state(2, np.uint64)
+        self.key = np.asarray(key, dtype=np.uint64)
+
+    def block(self, stream, index, shape, sub=0):
+        """The uniform draws stored at (stream, index, sub)."""
+        bit_generator = np.random.Philox(key=self.key, counter=[0, index, stream, sub])
+        return np.random.Generator(bit_generator).random(shape)
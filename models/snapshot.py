@@ -0,0 +1,13 @@
+import numpy as np
+
+
+def save_snapshot(state, path):
+    """Write an STAModel.snapshot() dict to a compressed .npz file."""
+    np.savez_compressed(path, **state)
+
+
+def load_snapshot(path):
+    """Read a snapshot written by save_snapshot, for STAModel.restore."""
+    with np.load(path) as data:
+        return {name: data[name].item() if data[name].ndim == 0 else data[name]
+                for name in data.files}
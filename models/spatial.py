@@ -0,0 +1,62 @@
+import itertools
+
+
+class SpatialGrid:
+    """Uniform bucket grid over the search area for fixed-radius proximity queries.
+
+    Items are stored in square cells of side ``cell_size``. With the cell size
+    set to the query radius, every item within that radius of a point lies in
+    the point's own cell or one of its 8 neighbours.
+    """
+
+    def __init__(self, cell_size):
+        self.cell_size = max(cell_size, 1)
+        self.cells = {}  # (cx, cy) -> {item: insertion order}
+        self.item_cells = {}  # item -> (cx, cy)
+        self._counter = itertools.count()
+
+    def cell_of(self, pos):
+        """Return the cell coordinates containing a position."""
+        return (int(pos[0] // self.cell_size), int(pos[1] // self.cell_size))
+
+    def insert(self, item, pos):
+        """Add an item at a position."""
+        cell = self.cell_of(pos)
+        self.cells.setdefault(cell, {})[item] = next(self._counter)
+        self.item_cells[item] = cell
+
+    def remove(self, item):
+        """Remove an item from the grid."""
+        cell = self.item_cells.pop(item)
+        bucket = self.cells[cell]
+        del bucket[item]
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, item, pos):
+        """Update an item's position, re-bucketing only if it changed cell."""
+        cell = self.cell_of(pos)
+        old_cell = self.item_cells[item]
+        if cell == old_cell:
+            return
+        order = self.cells[old_cell].pop(item)
+        if not self.cells[old_cell]:
+            del self.cells[old_cell]
+        self.cells.setdefault(cell, {})[item] = order
+        self.item_cells[item] = cell
+
+    def query(self, pos):
+        """Return items in the 3x3 block of cells around a position, in insertion order."""
+        cx, cy = self.cell_of(pos)
+        found = []
+        for dx in (-1, 0, 1):
+            for dy in (-1, 0, 1):
+                bucket = self.cells.get((cx + dx, cy + dy))
+                if bucket:
+                    found.extend(bucket.items())
+        if len(found) > 1:
+            found.sort(key=lambda entry: entry[1])
+        return [item for item, _ in found]
+
+    def __len__(self):
+        return len(self.item_cells)
@@ -1,18 +1,46 @@
+import itertools
+import json
+import time
+
 import mesa
 import numpy as np
-from .agent import STAAgent
+from .agent import MODES, STAAgent
 from .task import Task
+from .spatial import SpatialGrid
+from .stats import CompletionStats, run_with_warmup_detection
+from .profiling import LatencyHistogram, OperationCounters, PhaseProfiler
+from .rng import CounterRNG, seed_sequence, spawn_generators
+from .protocols import protocols_from_flags
 
 class STAModel(mesa.Model):
     """Search and Task Allocation Model."""
     
+    SPAWN_BATCH = 256  # Task positions drawn per refill of the spawn buffer
+    WALK_BATCH = 4096  # Random-walk steps drawn per refill of the walk buffer
+    MODES = MODES  # Agent mode codes in the modes array and snapshots
+    RNG_MODES = ("stream", "counter")
+    # Constructor arguments a restored or forked model cannot change
+    STRUCTURAL_PARAMS = ("num_agents", "num_tasks", "task_radius", 
+                         "required_agents_per_task", "agent_speed", "rng")
+    # Constructor arguments recorded in a snapshot (everything but the seed)
+    SNAPSHOT_PARAMS = STRUCTURAL_PARAMS + (
+        "communication_range", "response_duration", "use_communication", 
+        "use_calloff", "use_auction", "warmup_iterations")
+    # Overrides that choose a restored or forked model's protocols
+    PROTOCOL_OVERRIDES = ("protocols", "use_communication", "use_calloff", "use_auction")
+    
     def __init__(self, num_agents, num_tasks, task_radius, 
                  required_agents_per_task, agent_speed, 
                  communication_range=0, response_duration=60,
                  use_communication=False, use_calloff=False, 
-                 use_auction=False, seed=None):
+                 use_auction=False, seed=None, warmup_iterations=0,
+                 store_series=True, profile=False, record_latency=False,
+                 rng="stream", protocols=None):
         super().__init__()
         
+        if rng not in self.RNG_MODES:
+            raise ValueError(f"rng must be one of {self.RNG_MODES}, got {rng!r}")
+        
         # Parameters
         self.num_agents = num_agents  # R
         self.num_tasks = num_tasks  # T
@@ -22,115 +50,528 @@ class STAModel(mesa.Model):
         self.communication_range = communication_range  # Rd
         self.response_duration = response_duration  # Rt
         
+        self.rng = rng  # "stream" (sequential Generators) or "counter" (Philox)
+        
         # Communication protocol flags
         self.use_communication = use_communication
         self.use_calloff = use_calloff
         self.use_auction = use_auction  # Auction protocol flag
+        # Coordination protocols run through batched hooks (see Protocol);
+        # by default the built-in ones selected by the flags
+        self.custom_protocols = protocols is not None
+        if protocols is None:
+            protocols = protocols_from_flags(use_communication, use_calloff, 
+                                             use_auction)
+        self.protocols = list(protocols)
         
         # Statistics
+        self.steps = 0  # Steps taken since the initial state, kept across forks
         self.tasks_completed = 0
-        self.tasks_completed_per_iteration = []
+        # Per-step series is optional; the streaming summary skips the
+        # first warmup_iterations steps and is always kept
+        self.tasks_completed_per_iteration = [] if store_series else None
+        self.warmup_iterations = warmup_iterations
+        self.completion_stats = CompletionStats(warmup_iterations)
+        self.warmup_point = None  # Set by run_model(steady_iterations=...)
+        
+        # Opt-in per-phase timing; None keeps step() on the untimed path
+        self.profiler = PhaseProfiler() if profile else None
+        # Always-on integer counts of hot-path work (see get_operation_counts)
+        self.counters = OperationCounters()
+        # Optional histogram of per-step wall time, for tail latency
+        self.step_latency = LatencyHistogram() if record_latency else None
+        # Optional list of (step, task_id, generation, x, y) per completed
+        # task; set to [] to record (see ReplayRecorder)
+        self.completion_log = None
+        
+        # (agent id, task id) discoveries awaiting the protocols this step
+        self.discoveries = []
         
         # Agent type tracking (for cost analysis)
         self.strategic_agents = 0  # Count of agents who discover tasks
         self.reactive_agents = 0   # Count of agents who respond
         
-        # Set random seed if provided
-        if seed is not None:
-            np.random.seed(seed)
-            self.random = np.random.RandomState(seed)
+        # Independent random streams for agents and task spawns (unseeded
+        # models draw OS entropy); see _seed_streams
+        self._seed_streams(seed)
+        
+        # Spatial indexes with cells sized to the task radius, so proximity
+        # checks only look at the 3x3 block of cells around a position
+        self.agent_grid = SpatialGrid(self.task_radius)
+        self.task_grid = SpatialGrid(self.task_radius)
         
-        # Create agents with random initial positions
+        # Agent indices per mode, kept in sync by STAAgent.mode, so each step
+        # only visits agents that can act. Tasks whose membership changed
+        # since the last completion check are the only ones re-checked.
+        self.agents_by_mode = {"searching": set(), "waiting": set(), 
+                               "responding": set()}
+        self.dirty_tasks = set()
+        
+        # Agent state arrays for protocol hooks, kept in sync by STAAgent
+        self._allocate_agent_arrays(self.num_agents)
+        
+        # Create agents with random initial positions in [0, 1000] x [0, 1000]
         self.agents = []
+        if self.counter_rng is None:
+            positions = self.random.uniform(0, 1000, (self.num_agents, 2))
+        else:
+            positions = 1000 * self.counter_rng.block(CounterRNG.PLACEMENT, 0, 
+                                                      (self.num_agents, 2))
+        self.positions[:] = positions
+        positions = positions.tolist()
         for i in range(self.num_agents):
             agent = STAAgent(i, self, self.agent_speed)
-            # Random initial position in [0, 1000] x [0, 1000]
-            agent.pos = (self.random.uniform(0, 1000), 
-                        self.random.uniform(0, 1000))
+            agent.pos = tuple(positions[i])
             self.agents.append(agent)
+            self.agent_grid.insert(agent, agent.pos)
+        
+        # Task pool: task_id -> Task, one slot per simultaneous task. A
+        # completed slot is respawned in place, and every spawn gets a new
+        # generation number, so a stale reference is detected in O(1) by
+        # comparing generations.
+        self.tasks = {}
+        self.task_generation = {}
+        self._generations = itertools.count()
+        self.slot_spawns = [0] * self.num_tasks  # Spawns so far per slot
+        self.task_positions = np.zeros((self.num_tasks, 2))
         
         # Create initial tasks
-        self.tasks = []
         for i in range(self.num_tasks):
-            self._spawn_task(i)
+            task = Task(i, self._next_spawn_position(i), self.task_radius, 
+                        self.required_agents_per_task, self.counters)
+            self.tasks[i] = task
+            self._spawn_task(task)
+    
+    def _allocate_agent_arrays(self, num_agents):
+        """Create the per-agent arrays that protocols read (see Protocol)."""
+        self.positions = np.zeros((num_agents, 2))
+        self.modes = np.zeros(num_agents, dtype=np.int8)
+        self.targets = np.full(num_agents, -1, dtype=np.int64)
+        self.target_generations = np.full(num_agents, -1, dtype=np.int64)
+        self.response_timers = np.zeros(num_agents, dtype=np.int64)
+        # (task_id, generation) -> {agent_id: None} of agents heading there
+        self.responders = {}
+    
+    def _seed_streams(self, seed):
+        """Spawn the agent and task Generators from a seed and empty the draw buffers.
+        
+        Agent placement and random walks use self.random; task positions use
+        self.task_random. Both are drawn in blocks (WALK_BATCH walk steps,
+        SPAWN_BATCH task positions) and handed out one at a time. With
+        rng="counter", draws come from self.counter_rng instead, addressed by
+        (step, agent) for walks and (slot, spawn count) for task positions.
+        """
+        seed = seed_sequence(seed)
+        self.random, self.task_random = spawn_generators(seed, 2)
+        self.counter_rng = CounterRNG(seed) if self.rng == "counter" else None
+        self._walk_draws = []
+        self._walk_index = 0
+        self._walk_step = None  # Step whose counter-mode block is in _walk_draws
+        self._spawn_positions = []
+        self._spawn_index = 0
+    
+    def walk_draw(self, agent):
+        """A pair of uniform [0, 1) draws for one random-walk step of an agent."""
+        if self.counter_rng is not None:
+            # One block per step, row = agent, so each draw depends only on
+            # (seed, step, agent)
+            if self._walk_step != self.steps:
+                self._walk_draws = self.counter_rng.block(
+                    CounterRNG.WALK, self.steps, (self.num_agents, 2)).tolist()
+                self._walk_step = self.steps
+            return self._walk_draws[agent.unique_id]
+        
+        if self._walk_index == len(self._walk_draws):
+            self._walk_draws = self.random.random((self.WALK_BATCH, 2)).tolist()
+            self._walk_index = 0
+        draw = self._walk_draws[self._walk_index]
+        self._walk_index += 1
+        return draw
+    
+    def _next_spawn_position(self, task_id):
+        """Random position for the next spawn in a task slot."""
+        spawn = self.slot_spawns[task_id]
+        self.slot_spawns[task_id] += 1
+        if self.counter_rng is not None:
+            return tuple((1000 * self.counter_rng.block(
+                CounterRNG.TASK, spawn, 2, sub=task_id)).tolist())
+        
+        # Sequential positions, refilling the buffer when empty
+        if self._spawn_index == len(self._spawn_positions):
+            self._spawn_positions = self.task_random.uniform(
+                0, 1000, (self.SPAWN_BATCH, 2)).tolist()
+            self._spawn_index = 0
+        pos = self._spawn_positions[self._spawn_index]
+        self._spawn_index += 1
+        return tuple(pos)
     
-    def _spawn_task(self, task_id):
-        """Spawn a new task at a random location."""
-        pos = (self.random.uniform(0, 1000), self.random.uniform(0, 1000))
-        task = Task(task_id, pos, self.task_radius, 
-                   self.required_agents_per_task)
-        self.tasks.append(task)
+    def _spawn_task(self, task):
+        """Activate a task slot at its current position as a new generation."""
+        task.generation = next(self._generations)
+        self.task_generation[task.task_id] = task.generation
+        self.task_positions[task.task_id] = task.pos
+        self.task_grid.insert(task, task.pos)
         
         # Check if newly spawned task immediately has enough agents
         self._check_immediate_completion(task)
     
+    def _respawn_task(self, task):
+        """Reset a completed task slot in place at a new random location."""
+        self.counters.respawns += 1
+        self.task_grid.remove(task)
+        task.reset(self._next_spawn_position(task.task_id))
+        self._spawn_task(task)
+    
     def _check_immediate_completion(self, task):
         """Check if a newly spawned task can be completed immediately."""
-        for agent in self.agents:
+        for agent in self.agent_grid.query(task.pos):
             if agent.mode == "searching" and task.is_within_range(agent.pos):
-                task.add_agent(agent)
+                self.add_agent_to_task(task, agent)
                 agent.current_task = task
                 agent.mode = "waiting"
     
+    def is_current(self, task, generation):
+        """Whether a task reference from the given generation is still live."""
+        return self.task_generation.get(task.task_id) == generation
+    
+    def recruit_agents(self, agent_ids, task_id):
+        """Send agents to respond to a task for response_duration steps."""
+        task = self.tasks[int(task_id)]
+        for i in agent_ids:
+            agent = self.agents[i]
+            agent.mode = "responding"
+            agent.set_target(task)
+            agent.response_timer = self.response_duration
+    
+    def release_agents(self, agent_ids):
+        """Return agents to searching mode."""
+        for i in agent_ids:
+            self.agents[i].release()
+    
+    def add_agent_to_task(self, task, agent):
+        """Add an agent to a task and schedule the task for a completion check."""
+        task.add_agent(agent)
+        self.dirty_tasks.add(task)
+    
     def step(self):
         """Execute one step of the model."""
+        profiler = self.profiler
+        timed = profiler is not None or self.step_latency is not None
+        if timed:
+            step_start = time.perf_counter()
+        
         # Track tasks completed this iteration
         tasks_completed_this_iter = 0
         
-        # Move all agents
-        for agent in self.agents:
-            agent.step()
+        for protocol in self.protocols:
+            self._timed("on_step", protocol.on_step, self)
+        
+        # Move searching and responding agents; waiting agents never act
+        active = sorted(self.agents_by_mode["searching"] | 
+                        self.agents_by_mode["responding"])
+        for i in active:
+            self.agents[i].step()
         
-        # Check task completion
+        # Protocols handle every discovery of this step in one batched call
+        if self.discoveries:
+            discoveries, self.discoveries = self.discoveries, []
+            agents, tasks = np.array(discoveries, dtype=np.int64).T
+            for protocol in self.protocols:
+                self._timed("on_discovery", protocol.on_discovery, self, agents, tasks)
+        
+        # Check task completion; waiting agents never move, so only tasks
+        # that gained agents can have become complete
+        dirty, self.dirty_tasks = self.dirty_tasks, set()
         completed_tasks = []
-        for task in self.tasks:
-            if task.check_completion():
+        for task in sorted(dirty, key=lambda task: task.generation):
+            if self._timed("completion", task.check_completion):
                 completed_tasks.append(task)
                 tasks_completed_this_iter += 1
                 self.tasks_completed += 1
                 
-                # Emit call-off signal if using call-off protocol
-                if self.use_communication and self.use_calloff:
-                    self.emit_calloff_signal(task)
-                
                 # Release agents working on completed task
                 for agent in task.agents_in_range:
                     agent.release()
         
-        # Remove completed tasks and spawn new ones
+        if completed_tasks and self.protocols:
+            completed_ids = np.array([task.task_id for task in completed_tasks])
+            for protocol in self.protocols:
+                self._timed("on_completion", protocol.on_completion, self, completed_ids)
+        
+        if self.completion_log is not None:
+            self.completion_log.extend((self.steps, task.task_id, task.generation, *task.pos)
+                                       for task in completed_tasks)
+        
+        # Respawn completed task slots at new locations
         for task in completed_tasks:
-            self.tasks.remove(task)
-            self._spawn_task(task.task_id)
+            self._timed("respawn", self._respawn_task, task)
         
         # Record statistics
-        self.tasks_completed_per_iteration.append(tasks_completed_this_iter)
+        self.steps += 1
+        self.completion_stats.update(tasks_completed_this_iter)
+        if self.tasks_completed_per_iteration is not None:
+            self.tasks_completed_per_iteration.append(tasks_completed_this_iter)
+        
+        if timed:
+            elapsed = time.perf_counter() - step_start
+            if profiler is not None:
+                profiler.add("step", elapsed)
+            if self.step_latency is not None:
+                self.step_latency.record(elapsed)
     
-    def emit_calloff_signal(self, completed_task):
-        """Emit call-off signal to agents responding to this task."""
-        if self.communication_range <= 0:
-            return
+    def _timed(self, phase, function, *args):
+        """Call function(*args), timing it under phase when profiling is on."""
+        if self.profiler is None:
+            return function(*args)
+        return self.profiler.time(phase, function, *args)
+    
+    def get_operation_counts(self):
+        """Counts of distance evaluations, signals, auctions, call-offs and respawns so far."""
+        return self.counters.as_dict()
+    
+    def profile_report(self, print_table=True):
+        """Per-phase timing table (see PhaseProfiler.report); needs profile=True."""
+        if self.profiler is None:
+            raise ValueError("Model was created with profile=False")
+        return self.profiler.report(print_table)
+    
+    def report_discovery(self, agent, task):
+        """Queue a discovery for the protocols' on_discovery hooks at the end of the agent phase."""
+        self.discoveries.append((agent.unique_id, task.task_id))
+    
+    def snapshot(self):
+        """Capture the full state between steps as a flat dict of arrays and scalars.
+        
+        Holds the parameters, agent arrays (position, mode, task links,
+        response timer), task slots (position, generation, members), spatial
+        index order, pending completion checks, RNG and draw-buffer state,
+        statistics and operation counters. Restore it with
+        STAModel.restore or save it with save_snapshot. Profiler and latency
+        timings are not included.
+        """
+        agents, tasks = self.agents, [self.tasks[i] for i in range(self.num_tasks)]
+        
+        members = [agent.unique_id for task in tasks for agent in task.agents_in_range]
+        member_counts = [len(task.agents_in_range) for task in tasks]
+        
+        state = {name: getattr(self, name) for name in self.SNAPSHOT_PARAMS}
+        state.update({
+            # Protocol objects are not saved; restore needs them passed again
+            'custom_protocols': self.custom_protocols,
+            # Agents, indexed by unique_id
+            'agent_pos': self.positions.copy(),
+            'agent_mode': self.modes.copy(),
+            'agent_current_task': np.array(
+                [-1 if agent.current_task is None else agent.current_task.task_id 
+                 for agent in agents], dtype=np.int32),
+            'agent_target_task': self.targets.astype(np.int32),
+            'agent_target_generation': self.target_generations.copy(),
+            'agent_response_timer': self.response_timers.astype(np.int32),
+            'agent_discovered': np.array([agent.discovered_task for agent in agents], dtype=bool),
+            'agent_grid_order': self._grid_order(self.agent_grid, agents),
+            # Task slots, indexed by task_id; members are concatenated
+            'task_pos': np.array([task.pos for task in tasks], dtype=float).reshape(-1, 2),
+            'task_generation': np.array([task.generation for task in tasks], dtype=np.int64),
+            'task_members': np.array(members, dtype=np.int32),
+            'task_member_counts': np.array(member_counts, dtype=np.int32),
+            'task_grid_order': self._grid_order(self.task_grid, tasks),
+            'dirty_tasks': np.array(sorted(task.task_id for task in self.dirty_tasks), 
+                                    dtype=np.int32),
+            # Random state
+            'steps': self.steps,
+            'slot_spawns': np.array(self.slot_spawns, dtype=np.int64),
+            'agent_rng_state': json.dumps(self.random.bit_generator.state),
+            'task_rng_state': json.dumps(self.task_random.bit_generator.state),
+            'walk_draws': np.array(self._walk_draws[self._walk_index:] 
+                                   if self.counter_rng is None else [], 
+                                   dtype=float).reshape(-1, 2),
+            'spawn_positions': np.array(self._spawn_positions[self._spawn_index:], 
+                                        dtype=float).reshape(-1, 2),
+            'next_generation': next(self._generations),
+            # Statistics
+            'tasks_completed': self.tasks_completed,
+            'strategic_agents': self.strategic_agents,
+            'reactive_agents': self.reactive_agents,
+            'stats_iterations': self.completion_stats.iterations,
+            'stats_count': self.completion_stats.count,
+            'stats_mean': float(self.completion_stats.mean),
+            'stats_total': int(self.completion_stats.total),
+            'stats_m2': float(self.completion_stats._m2),
+            'counters': np.array([getattr(self.counters, name) 
+                                  for name in OperationCounters.FIELDS], dtype=np.int64),
+        })
+        # next() consumed a generation number; put it back
+        self._generations = itertools.count(state['next_generation'])
+        if self.counter_rng is not None:
+            state['counter_key'] = self.counter_rng.key.copy()
+        if self.tasks_completed_per_iteration is not None:
+            state['series'] = np.array(self.tasks_completed_per_iteration, dtype=np.int64)
+        return state
+    
+    @staticmethod
+    def _grid_order(grid, items):
+        """Insertion-order keys of items in a spatial grid, which fix query order."""
+        return np.array([grid.cells[grid.item_cells[item]][item] for item in items], 
+                        dtype=np.int64)
+    
+    @classmethod
+    def restore(cls, state, store_series=True, profile=False, record_latency=False, 
+                **overrides):
+        """Rebuild a model from a snapshot; it continues exactly as the original would.
+        
+        overrides may change the protocol flags or protocols,
+        communication_range, response_duration or warmup_iterations. The population parameters
+        (STRUCTURAL_PARAMS) are fixed by the snapshot. Agents that were
+        responding keep responding under the new settings. A snapshot of a
+        model built with protocols=[...] must be given protocols (or new
+        protocol flags) again, since the protocol objects are not saved.
+        """
+        fixed = set(overrides) & set(cls.STRUCTURAL_PARAMS)
+        if fixed:
+            raise ValueError(f"Cannot change {', '.join(sorted(fixed))} of a snapshot")
+        if (bool(state.get('custom_protocols', False))
+                and not set(overrides) & set(cls.PROTOCOL_OVERRIDES)):
+            raise ValueError("Snapshot of a model with custom protocols; "
+                             "pass protocols=[...] to restore it")
+        params = {name: state[name] for name in cls.SNAPSHOT_PARAMS}
+        params.update(overrides)
+        
+        # Build an empty model, then load agents and tasks without drawing
+        model = cls(**{**params, 'num_agents': 0, 'num_tasks': 0}, 
+                    store_series=store_series, profile=profile, 
+                    record_latency=record_latency)
+        model.num_agents = params['num_agents']
+        model.num_tasks = params['num_tasks']
+        model._load_state(state)
+        return model
+    
+    def _load_state(self, state):
+        """Populate an empty model from a snapshot (see restore)."""
+        self.task_positions = state['task_pos'].copy()
+        self._allocate_agent_arrays(self.num_agents)
+        for i in range(self.num_tasks):
+            self.tasks[i] = Task(i, tuple(state['task_pos'][i].tolist()), self.task_radius, 
+                                 self.required_agents_per_task, self.counters)
+            self.tasks[i].generation = int(state['task_generation'][i])
+            self.task_generation[i] = self.tasks[i].generation
+        for i in np.argsort(state['task_grid_order'], kind='stable'):
+            self.task_grid.insert(self.tasks[i], self.tasks[i].pos)
+        
+        def task(task_id):
+            return None if task_id < 0 else self.tasks[int(task_id)]
         
-        # Find agents within communication range of the task
-        for agent in self.agents:
-            if agent.mode == "responding" and agent.target_task == completed_task:
-                distance = np.sqrt(
-                    (agent.pos[0] - completed_task.pos[0])**2 + 
-                    (agent.pos[1] - completed_task.pos[1])**2
-                )
-                if distance <= self.communication_range:
-                    agent.receive_calloff_signal()
-    
-    def run_model(self, num_iterations):
-        """Run the model for a specified number of iterations."""
+        for i in range(self.num_agents):
+            agent = STAAgent(i, self, self.agent_speed)
+            agent.pos = tuple(state['agent_pos'][i].tolist())
+            self.positions[i] = agent.pos
+            agent.mode = self.MODES[state['agent_mode'][i]]
+            agent.current_task = task(state['agent_current_task'][i])
+            agent.response_timer = int(state['agent_response_timer'][i])
+            agent.discovered_task = bool(state['agent_discovered'][i])
+            agent.target_task = task(state['agent_target_task'][i])
+            if agent.target_task is not None:
+                agent.target_generation = int(state['agent_target_generation'][i])
+                self.targets[i] = agent.target_task.task_id
+                self.target_generations[i] = agent.target_generation
+                self.responders.setdefault(
+                    (agent.target_task.task_id, agent.target_generation), {})[i] = None
+            self.agents.append(agent)
+        for i in np.argsort(state['agent_grid_order'], kind='stable'):
+            self.agent_grid.insert(self.agents[i], self.agents[i].pos)
+        
+        offsets = np.concatenate([[0], np.cumsum(state['task_member_counts'])])
+        for i in range(self.num_tasks):
+            for agent_id in state['task_members'][offsets[i]:offsets[i + 1]]:
+                self.tasks[i].add_agent(self.agents[agent_id])
+        self.dirty_tasks = {self.tasks[int(i)] for i in state['dirty_tasks']}
+        
+        self.random.bit_generator.state = json.loads(state['agent_rng_state'])
+        self.task_random.bit_generator.state = json.loads(state['task_rng_state'])
+        self._walk_draws = state['walk_draws'].tolist()
+        self._walk_index = 0
+        if self.counter_rng is not None:
+            self.counter_rng = CounterRNG(key=state['counter_key'])
+            self._walk_draws = []
+        self.steps = int(state['steps'])
+        self.slot_spawns = state['slot_spawns'].tolist()
+        self._spawn_positions = state['spawn_positions'].tolist()
+        self._spawn_index = 0
+        self._generations = itertools.count(int(state['next_generation']))
+        
+        self.tasks_completed = int(state['tasks_completed'])
+        self.strategic_agents = int(state['strategic_agents'])
+        self.reactive_agents = int(state['reactive_agents'])
+        stats = self.completion_stats
+        stats.iterations = int(state['stats_iterations'])
+        stats.count = int(state['stats_count'])
+        stats.mean = np.array(state['stats_mean'], dtype=float)
+        stats.total = np.array(state['stats_total'], dtype=np.int64)
+        stats._m2 = np.array(state['stats_m2'], dtype=float)
+        for name, value in zip(OperationCounters.FIELDS, state['counters']):
+            setattr(self.counters, name, int(value))
+        if self.tasks_completed_per_iteration is not None and 'series' in state:
+            self.tasks_completed_per_iteration = state['series'].tolist()
+    
+    def fork(self, seed=None, store_series=True, profile=False, record_latency=False, 
+             **overrides):
+        """Start a continuation run from this model's current state.
+        
+        The child shares the parent's agents and tasks but starts with empty
+        statistics and counters, so its results cover only the continuation.
+        With seed=None it also inherits the random state, so children that
+        differ only in overrides (protocol, Rd) see the same random draws
+        wherever their trajectories agree. A seed gives the child its own
+        streams (and draw buffers) for independent replications. Unless
+        overrides choose new ones, the child runs the parent's protocols.
+        """
+        if self.custom_protocols and not set(overrides) & set(self.PROTOCOL_OVERRIDES):
+            overrides['protocols'] = self.protocols
+        state = self.snapshot()
+        model = self.restore(state, store_series, profile, record_latency, **overrides)
+        model.tasks_completed = 0
+        model.strategic_agents = model.reactive_agents = 0
+        model.completion_stats = CompletionStats(model.warmup_iterations)
+        model.counters = OperationCounters()
+        for task in model.tasks.values():
+            task.counters = model.counters
+        if model.tasks_completed_per_iteration is not None:
+            model.tasks_completed_per_iteration = []
+        if seed is not None:
+            model._seed_streams(seed)
+        return model
+    
+    def run_model(self, num_iterations, steady_iterations=None, check_interval=100):
+        """Run the model for a specified number of iterations.
+        
+        With steady_iterations, num_iterations is only an upper bound: the
+        run stops once MSER finds a warm-up point followed by at least
+        steady_iterations iterations. The detected warm-up length is stored
+        in self.warmup_point and completion_stats is rebuilt to cover only
+        the iterations after it. This needs store_series=True.
+        """
+        if steady_iterations is not None:
+            self.warmup_point = run_with_warmup_detection(
+                self, num_iterations, steady_iterations, check_interval)
+            return
         for _ in range(num_iterations):
             self.step()
     
     def get_average_completion_rate(self):
         """Calculate average tasks completed per iteration."""
-        if len(self.tasks_completed_per_iteration) == 0:
+        if self.completion_stats.iterations == 0:
             return 0
+        if self.tasks_completed_per_iteration is None:
+            return self.tasks_completed / self.completion_stats.iterations
         return np.mean(self.tasks_completed_per_iteration)
     
+    def get_steady_state_rate(self):
+        """Get (mean, std) of tasks completed per iteration after the warm-up."""
+        return (float(self.completion_stats.mean), 
+                float(self.completion_stats.std()))
+    
     def get_completion_rate_over_time(self):
         """Get the task completion rate over time."""
+        if self.tasks_completed_per_iteration is None:
+            raise ValueError("Model was created with store_series=False; "
+                             "use get_steady_state_rate() instead")
         return self.tasks_completed_per_iteration
\ No newline at end of file
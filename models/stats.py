@@ -0,0 +1,118 @@
+import numpy as np
+
+
+class CompletionStats:
+    """Streaming steady-state statistics of tasks completed per iteration.
+
+    The first ``warmup_iterations`` updates are counted but otherwise ignored;
+    later ones feed Welford running mean/variance updates, so the summary of
+    an arbitrarily long run takes O(1) memory. ``shape`` is () for a single
+    model and (replicas,) for a replica batch.
+    """
+
+    def __init__(self, warmup_iterations=0, shape=()):
+        self.warmup_iterations = warmup_iterations
+        self.iterations = 0  # Every update, warm-up included
+        self.count = 0  # Post-warm-up updates
+        self.mean = np.zeros(shape)
+        self.total = np.zeros(shape, dtype=np.int64)  # Post-warm-up completions
+        self._m2 = np.zeros(shape)
+
+    @classmethod
+    def from_series(cls, series, warmup_iterations=0):
+        """Statistics of a whole stored completion series, as if fed by update()."""
+        values = np.asarray(series)
+        stats = cls(warmup_iterations, values.shape[1:])
+        steady = values[warmup_iterations:]
+        stats.iterations = len(values)
+        stats.count = len(steady)
+        if stats.count:
+            stats.total = steady.sum(axis=0).astype(np.int64)
+            stats.mean = steady.mean(axis=0)
+            stats._m2 = ((steady - stats.mean) ** 2).sum(axis=0)
+        return stats
+
+    def update(self, completed):
+        """Add one iteration's completion count(s)."""
+        self.iterations += 1
+        if self.iterations <= self.warmup_iterations:
+            return
+        self.count += 1
+        self.total = self.total + completed
+        delta = completed - self.mean
+        self.mean = self.mean + delta / self.count
+        self._m2 = self._m2 + delta * (completed - self.mean)
+
+    def variance(self, ddof=0):
+        """Variance of the post-warm-up per-iteration counts (np.var convention)."""
+        if self.count <= ddof:
+            return np.zeros_like(self._m2)
+        return self._m2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        """Standard deviation of the post-warm-up per-iteration counts."""
+        return np.sqrt(self.variance(ddof))
+
+
+def mser_truncation(series, batch_size=5):
+    """MSER-``batch_size`` warm-up truncation point of a completion series.
+
+    The series is cut into non-overlapping batch means Z_1..Z_k; the
+    truncation d (in batches) minimises sum_{i>d} (Z_i - mean(Z_d+1..k))^2
+    / (k - d)^2 over d <= k/2. Later points are not considered: their short
+    tails (e.g. a run of zero-completion batches) have spuriously small
+    spread. Returns the truncation as an iteration index.
+    """
+    values = np.asarray(series, dtype=float)
+    num_batches = len(values) // batch_size
+    if num_batches < 3:
+        return 0
+    batches = values[:num_batches * batch_size].reshape(num_batches, batch_size).mean(axis=1)
+
+    # Sums over every suffix Z_d..Z_k with d <= k/2, via reversed cumulative sums
+    candidates = num_batches // 2 + 1
+    tail_sum = np.cumsum(batches[::-1])[::-1][:candidates]
+    tail_square = np.cumsum(batches[::-1] ** 2)[::-1][:candidates]
+    remaining = np.arange(num_batches, num_batches - candidates, -1)
+    spread = np.maximum(tail_square - tail_sum ** 2 / remaining, 0)
+    return int(np.argmin(spread / remaining ** 2)) * batch_size
+
+
+def completion_batch_size(series, min_batch_size=5, completions_per_batch=2):
+    """MSER batch size at which batches hold ``completions_per_batch`` completions on average.
+
+    Completion series are mostly zeros, and MSER-5 on them mostly compares
+    runs of empty batches; longer batches give means that reflect the rate.
+    """
+    total = float(np.sum(series))
+    if total <= 0:
+        return min_batch_size
+    return max(min_batch_size, int(np.ceil(completions_per_batch * len(series) / total)))
+
+
+def run_with_warmup_detection(model, max_iterations, steady_iterations,
+                              check_interval=100, batch_size=None):
+    """Step a model until MSER finds a warm-up followed by steady_iterations iterations.
+
+    The truncation point is re-estimated every ``check_interval`` steps,
+    with batches sized by completion_batch_size unless ``batch_size`` is
+    given; the run stops once at least ``steady_iterations`` iterations
+    follow it, or after ``max_iterations`` steps. Returns the warm-up length
+    and rebuilds ``model.completion_stats`` so it only covers the
+    iterations after it.
+    """
+    if model.tasks_completed_per_iteration is None:
+        raise ValueError("Warm-up detection needs the stored completion series; "
+                         "create the model with store_series=True")
+    warmup = 0
+    for iteration in range(1, max_iterations + 1):
+        model.step()
+        if iteration % check_interval and iteration != max_iterations:
+            continue
+        series = model.get_completion_rate_over_time()
+        warmup = mser_truncation(series, batch_size or completion_batch_size(series))
+        if iteration - warmup >= steady_iterations:
+            break
+    model.completion_stats = CompletionStats.from_series(
+        model.get_completion_rate_over_time(), warmup)
+    return warmup
@@ -1,37 +1,47 @@
 import numpy as np
 
+from .profiling import OperationCounters
+
 class Task:
     """A task that requires agents to complete."""
     
-    def __init__(self, task_id, pos, radius, required_agents):
+    def __init__(self, task_id, pos, radius, required_agents, counters=None):
         self.task_id = task_id
         self.pos = pos  # (x, y) position
         self.radius = radius  # Tr - task radius
         self.required_agents = required_agents  # Tc - number of agents needed
-        self.agents_in_range = []  # Agents currently within radius
+        self.agents_in_range = {}  # Agents within radius (dict as an ordered set)
+        self.completed = False
+        self.generation = None  # Set by the model at spawn
+        # Work counters, normally shared with the owning model
+        self.counters = counters if counters is not None else OperationCounters()
+    
+    def reset(self, pos):
+        """Reuse this task object for a new task at another position."""
+        self.pos = pos
+        self.agents_in_range.clear()
         self.completed = False
     
     def is_within_range(self, agent_pos):
         """Check if a position is within task radius."""
+        self.counters.distance_evaluations += 1
         distance = np.sqrt((agent_pos[0] - self.pos[0])**2 + 
                           (agent_pos[1] - self.pos[1])**2)
         return distance <= self.radius
     
     def add_agent(self, agent):
         """Add an agent to the task."""
-        if agent not in self.agents_in_range:
-            self.agents_in_range.append(agent)
+        self.agents_in_range.setdefault(agent)
     
     def remove_agent(self, agent):
         """Remove an agent from the task."""
-        if agent in self.agents_in_range:
-            self.agents_in_range.remove(agent)
+        self.agents_in_range.pop(agent, None)
     
     def check_completion(self):
         """Check if task has enough agents to complete."""
         # Filter agents that are actually within range
-        valid_agents = [agent for agent in self.agents_in_range 
-                       if self.is_within_range(agent.pos)]
+        valid_agents = {agent: None for agent in self.agents_in_range 
+                        if self.is_within_range(agent.pos)}
         
         self.agents_in_range = valid_agents
         
@@ -39,12 +49,14 @@ class Task:
             # Select Tc closest agents if more than required
             if len(self.agents_in_range) > self.required_agents:
                 # Sort by distance and keep closest Tc agents
+                self.counters.distance_evaluations += len(self.agents_in_range)
                 sorted_agents = sorted(
                     self.agents_in_range,
                     key=lambda a: np.sqrt((a.pos[0] - self.pos[0])**2 + 
                                          (a.pos[1] - self.pos[1])**2)
                 )
-                self.agents_in_range = sorted_agents[:self.required_agents]
+                self.agents_in_range = dict.fromkeys(
+                    sorted_agents[:self.required_agents])
             
             self.completed = True
             return True
@@ -52,5 +64,6 @@ class Task:
     
     def get_distance_to(self, agent):
         """Get distance from agent to task."""
+        self.counters.distance_evaluations += 1
         return np.sqrt((agent.pos[0] - self.pos[0])**2 + 
                       (agent.pos[1] - self.pos[1])**2)
\ No newline at end of file
@@ -0,0 +1,411 @@
+import numpy as np
+
+from .rng import spawn_generators
+from .stats import CompletionStats, run_with_warmup_detection
+
+# Agent mode codes (mirror STAAgent.mode strings)
+SEARCHING = 0
+WAITING = 1
+RESPONDING = 2
+
+ARENA_SIZE = 1000  # Search area is [0, 1000] x [0, 1000]
+
+# Agent-task pairs tested per block in _first_task_in_range; bounds the
+# temporary (agents x tasks) arrays to a few tens of MB whatever R and T are
+PROXIMITY_BLOCK = 1 << 20
+
+
+def _clip(coords):
+    """Clip coordinates to the arena in place (cheaper than np.clip on small arrays)."""
+    np.maximum(coords, 0, out=coords)
+    return np.minimum(coords, ARENA_SIZE, out=coords)
+
+
+class BatchedSTAModel:
+    """Search and Task Allocation Model for many independent replicas at once.
+
+    Agent state is held in flat NumPy arrays of length replicas * agents and
+    task state in arrays of length replicas * tasks, so agent ``a`` of replica
+    ``r`` lives at index ``r * num_agents + a``. Every step advances all
+    replicas with the same handful of batched array operations; replicas never
+    interact. Use ``agent_view`` to look at a state array as
+    (replicas, agents).
+    """
+
+    def __init__(self, num_agents, num_tasks, task_radius,
+                 required_agents_per_task, agent_speed,
+                 communication_range=0, response_duration=60,
+                 use_communication=False, use_calloff=False,
+                 use_auction=False, seed=None, num_replicas=1,
+                 warmup_iterations=0, store_series=True):
+        # Parameters
+        self.num_agents = num_agents  # R
+        self.num_tasks = num_tasks  # T
+        self.task_radius = task_radius  # Tr
+        self.required_agents_per_task = required_agents_per_task  # Tc
+        self.agent_speed = agent_speed  # Rv
+        self.communication_range = communication_range  # Rd
+        self.response_duration = response_duration  # Rt
+        self.num_replicas = num_replicas
+
+        # Communication protocol flags
+        self.use_communication = use_communication
+        self.use_calloff = use_calloff
+        self.use_auction = use_auction
+
+        # Statistics
+        self.tasks_completed = np.zeros(num_replicas, dtype=np.int64)
+        self.tasks_completed_per_iteration = [] if store_series else None
+        self.completion_stats = CompletionStats(warmup_iterations,
+                                                shape=(num_replicas,))
+
+        # Agent and task streams, spawned as in STAModel
+        self.random, self.task_random = spawn_generators(seed, 2)
+
+        # Agent state. Positions are drawn as (x, y) pairs so a single
+        # replica is placed exactly where STAModel places its agents.
+        size = num_replicas * num_agents
+        initial = self.random.uniform(0, ARENA_SIZE, (size, 2))
+        self.x = initial[:, 0].copy()
+        self.y = initial[:, 1].copy()
+        self.mode = np.full(size, SEARCHING, dtype=np.int8)
+        self.task = np.full(size, -1, dtype=np.int64)  # Task waited at
+        self.target = np.full(size, -1, dtype=np.int64)  # Task responded to
+        self.target_generation = np.zeros(size, dtype=np.int64)
+        self.response_timer = np.zeros(size, dtype=np.int64)
+        self.replica = np.arange(size) // num_agents
+
+        # Task state, one slot per task. The generation counter changes every
+        # time a slot is respawned so responders can tell their task is gone.
+        self.task_x = np.zeros(num_replicas * num_tasks)
+        self.task_y = np.zeros(num_replicas * num_tasks)
+        self.task_generation = np.zeros(num_replicas * num_tasks, dtype=np.int64)
+        self._spawn_tasks(np.arange(num_replicas * num_tasks))
+
+    @property
+    def recruits(self):
+        """Whether discoverers recruit other agents on this configuration."""
+        return (self.communication_range > 0
+                and (self.use_auction or self.use_communication))
+
+    def agent_view(self, values):
+        """Reshape a flat per-agent array to (replicas, agents)."""
+        return values.reshape(self.num_replicas, self.num_agents)
+
+    def task_view(self, values):
+        """Reshape a flat per-task array to (replicas, tasks)."""
+        return values.reshape(self.num_replicas, self.num_tasks)
+
+    def _spawn_tasks(self, task_ids):
+        """Place task slots at new random locations."""
+        positions = self.task_random.uniform(0, ARENA_SIZE, (task_ids.size, 2))
+        self.task_x[task_ids] = positions[:, 0]
+        self.task_y[task_ids] = positions[:, 1]
+        self.task_generation[task_ids] += 1
+        self._check_immediate_completion(task_ids)
+
+    def _first_task_in_range(self, idx, x, y, candidate_tasks=None):
+        """Return (found mask, flat task index) of the first task in range of each agent.
+
+        Only tasks of the agent's own replica are considered, optionally
+        restricted by a per-task boolean mask. Agents are processed in
+        blocks of about PROXIMITY_BLOCK agent-task pairs.
+        """
+        found = np.zeros(idx.size, dtype=bool)
+        if self.num_tasks == 0:
+            return found, np.zeros(0, dtype=np.int64)
+        first = np.zeros(idx.size, dtype=np.int64)
+        rows = max(1, PROXIMITY_BLOCK // self.num_tasks)
+        for start in range(0, idx.size, rows):
+            block = slice(start, start + rows)
+            replica = self.replica[idx[block]]
+            dx = x[block, None] - self.task_view(self.task_x)[replica]
+            dy = y[block, None] - self.task_view(self.task_y)[replica]
+            in_range = dx * dx + dy * dy <= self.task_radius ** 2
+            if candidate_tasks is not None:
+                in_range &= self.task_view(candidate_tasks)[replica]
+            found[block] = in_range.any(axis=1)
+            first[block] = in_range.argmax(axis=1)
+        return found, self.replica[idx[found]] * self.num_tasks + first[found]
+
+    def _check_immediate_completion(self, task_ids):
+        """Park searching agents that newly spawned tasks land on."""
+        searching = (self.mode == SEARCHING).nonzero()[0]
+        if searching.size == 0:
+            return
+        spawned = np.zeros(self.task_x.size, dtype=bool)
+        spawned[task_ids] = True
+        found, task = self._first_task_in_range(
+            searching, self.x[searching], self.y[searching], spawned)
+        captured = searching[found]
+        self.mode[captured] = WAITING
+        self.task[captured] = task
+
+    def _release(self, idx):
+        """Release agents back to searching mode."""
+        self.mode[idx] = SEARCHING
+        self.task[idx] = -1
+        self.target[idx] = -1
+        self.response_timer[idx] = 0
+
+    def _advance_responders(self, idx):
+        """Move responding agents toward their target tasks."""
+        target = self.target[idx]
+
+        # Target completed (and respawned) since the signal was received
+        stale = self.target_generation[idx] != self.task_generation[target]
+        self._release(idx[stale])
+        idx, target = idx[~stale], target[~stale]
+
+        self.response_timer[idx] -= 1
+
+        dx = self.task_x[target] - self.x[idx]
+        dy = self.task_y[target] - self.y[idx]
+        distance = np.sqrt(dx * dx + dy * dy)
+
+        arrived = distance <= self.task_radius
+        arrivals = idx[arrived]
+        self.mode[arrivals] = WAITING
+        self.task[arrivals] = target[arrived]
+        self.target[arrivals] = -1
+
+        expired = ~arrived & (self.response_timer[idx] <= 0)
+        self._release(idx[expired])
+
+        # Move at full speed toward the task (distance > Tr >= 0 here)
+        moving = ~arrived & ~expired
+        movers = idx[moving]
+        scale = np.minimum(self.agent_speed, distance[moving]) / distance[moving]
+        self.x[movers] = _clip(self.x[movers] + dx[moving] * scale)
+        self.y[movers] = _clip(self.y[movers] + dy[moving] * scale)
+
+    def _advance_searchers(self, idx):
+        """Random-walk searching agents and park those that find a task.
+
+        Returns the indices of agents that discovered a task this step.
+        """
+        angle = self.random.uniform(0, 2 * np.pi, idx.size)
+        distance = self.random.uniform(0, self.agent_speed, idx.size)
+        x = _clip(self.x[idx] + distance * np.cos(angle))
+        y = _clip(self.y[idx] + distance * np.sin(angle))
+        self.x[idx] = x
+        self.y[idx] = y
+
+        # Each searcher stops at the first task within range
+        found, task = self._first_task_in_range(idx, x, y)
+        discoverers = idx[found]
+        self.mode[discoverers] = WAITING
+        self.task[discoverers] = task
+        return discoverers
+
+    def _recruit(self, discoverers):
+        """Call-out or auction recruitment for each discoverer.
+
+        Discoverers of one replica are handled in agent order because each
+        recruitment removes candidates for the next. Different replicas are
+        independent, so round ``k`` serves the k-th discoverer of every
+        replica at once.
+        """
+        replica = self.replica[discoverers]
+        first = np.searchsorted(replica, replica)
+        rank = np.arange(discoverers.size) - first
+
+        for round_ in range(rank.max() + 1):
+            agents = discoverers[rank == round_]
+            rows = self.replica[agents]
+
+            dx = self.agent_view(self.x)[rows] - self.x[agents, None]
+            dy = self.agent_view(self.y)[rows] - self.y[agents, None]
+            distance = np.sqrt(dx * dx + dy * dy)
+            eligible = ((self.agent_view(self.mode)[rows] == SEARCHING)
+                        & (distance <= self.communication_range))
+
+            if self.use_auction:
+                # Auction: closest (Tc - 1) bidders win
+                distance = np.where(eligible, distance, np.inf)
+                order = np.argsort(distance, axis=1, kind='stable')
+                order = order[:, :self.required_agents_per_task - 1]
+                won = np.isfinite(np.take_along_axis(distance, order, axis=1))
+                winner_rows = np.broadcast_to(np.arange(agents.size)[:, None], order.shape)[won]
+                columns = order[won]
+            else:
+                winner_rows, columns = eligible.nonzero()
+
+            recruits = rows[winner_rows] * self.num_agents + columns
+            task = self.task[agents][winner_rows]
+            self.mode[recruits] = RESPONDING
+            self.target[recruits] = task
+            self.target_generation[recruits] = self.task_generation[task]
+            self.response_timer[recruits] = self.response_duration
+
+    def _complete_tasks(self, completed, waiting):
+        """Release the Tc closest agents at each completed task."""
+        done = np.zeros(self.task_x.size, dtype=bool)
+        done[completed] = True
+        members = waiting[done[self.task[waiting]]]
+
+        counts = np.bincount(self.task[members], minlength=self.task_x.size)
+        for task_id in (counts > self.required_agents_per_task).nonzero()[0]:
+            crowd = members[self.task[members] == task_id]
+            dx = self.x[crowd] - self.task_x[task_id]
+            dy = self.y[crowd] - self.task_y[task_id]
+            order = np.argsort(dx * dx + dy * dy, kind='stable')
+            # Like STAModel, agents beyond the Tc closest stay parked
+            self.task[crowd[order[self.required_agents_per_task:]]] = -1
+
+        self._release(members[self.task[members] >= 0])
+        return done
+
+    def emit_calloff_signal(self, done):
+        """Release responders heading to completed tasks within call-off range."""
+        if self.communication_range <= 0:
+            return
+
+        responders = (self.mode == RESPONDING).nonzero()[0]
+        target = self.target[responders]
+        affected = done[target] & (self.target_generation[responders]
+                                   == self.task_generation[target])
+        responders, target = responders[affected], target[affected]
+        dx = self.x[responders] - self.task_x[target]
+        dy = self.y[responders] - self.task_y[target]
+        in_range = dx * dx + dy * dy <= self.communication_range ** 2
+        self._release(responders[in_range])
+
+    def step(self):
+        """Execute one step of every replica."""
+        # Like STAModel, agents act in the mode they start the step in, so
+        # responders released below do not also search this step
+        searching = (self.mode == SEARCHING).nonzero()[0]
+        responding = (self.mode == RESPONDING).nonzero()[0]
+        if responding.size:
+            self._advance_responders(responding)
+
+        if searching.size:
+            discoverers = self._advance_searchers(searching)
+            if discoverers.size and self.recruits:
+                self._recruit(discoverers)
+
+        # Check task completion
+        waiting = ((self.mode == WAITING) & (self.task >= 0)).nonzero()[0]
+        counts = np.bincount(self.task[waiting], minlength=self.task_x.size)
+        completed = (counts >= self.required_agents_per_task).nonzero()[0]
+        if completed.size:
+            done = self._complete_tasks(completed, waiting)
+            if self.use_communication and self.use_calloff:
+                self.emit_calloff_signal(done)
+            self._spawn_tasks(completed)
+
+        # Record statistics
+        per_replica = np.bincount(completed // self.num_tasks,
+                                  minlength=self.num_replicas)
+        self._record_completions(per_replica)
+
+    def _record_completions(self, per_replica):
+        """Store this step's completions for every replica."""
+        self.tasks_completed += per_replica
+        self.completion_stats.update(per_replica)
+        if self.tasks_completed_per_iteration is not None:
+            self.tasks_completed_per_iteration.append(per_replica)
+
+    def run_model(self, num_iterations):
+        """Run every replica for a specified number of iterations."""
+        for _ in range(num_iterations):
+            self.step()
+
+    def get_average_completion_rate(self):
+        """Calculate average tasks completed per iteration, per replica."""
+        if self.completion_stats.iterations == 0:
+            return np.zeros(self.num_replicas)
+        return self.tasks_completed / self.completion_stats.iterations
+
+    def get_steady_state_rate(self):
+        """Get per-replica (mean, std) of tasks completed per iteration after the warm-up."""
+        return self.completion_stats.mean, self.completion_stats.std()
+
+    def get_completion_rate_over_time(self):
+        """Get the task completion rate over time as a (replicas, iterations) array."""
+        if self.tasks_completed_per_iteration is None:
+            raise ValueError("Model was created with store_series=False; "
+                             "use get_steady_state_rate() instead")
+        if len(self.tasks_completed_per_iteration) == 0:
+            return np.zeros((self.num_replicas, 0), dtype=np.int64)
+        return np.stack(self.tasks_completed_per_iteration, axis=1)
+
+
+class VectorizedSTAModel(BatchedSTAModel):
+    """Search and Task Allocation Model with agent state held in NumPy arrays.
+
+    Drop-in alternative to STAModel: takes the same constructor parameters and
+    produces the same statistics, but advances the whole swarm with batched
+    array operations instead of one Python method call per agent.
+    """
+
+    def __init__(self, num_agents, num_tasks, task_radius,
+                 required_agents_per_task, agent_speed,
+                 communication_range=0, response_duration=60,
+                 use_communication=False, use_calloff=False,
+                 use_auction=False, seed=None, warmup_iterations=0,
+                 store_series=True):
+        super().__init__(num_agents, num_tasks, task_radius,
+                         required_agents_per_task, agent_speed,
+                         communication_range=communication_range,
+                         response_duration=response_duration,
+                         use_communication=use_communication,
+                         use_calloff=use_calloff, use_auction=use_auction,
+                         seed=seed, num_replicas=1,
+                         warmup_iterations=warmup_iterations,
+                         store_series=store_series)
+        self.tasks_completed = 0
+        self.completion_stats = CompletionStats(warmup_iterations)
+        self.warmup_point = None  # Set by run_model(steady_iterations=...)
+
+    def _record_completions(self, per_replica):
+        """Store this step's completion count."""
+        completed = int(per_replica[0])
+        self.tasks_completed += completed
+        self.completion_stats.update(completed)
+        if self.tasks_completed_per_iteration is not None:
+            self.tasks_completed_per_iteration.append(completed)
+
+    def run_model(self, num_iterations, steady_iterations=None, check_interval=100):
+        """Run the model for a specified number of iterations.
+
+        With steady_iterations, stops early once MSER finds a warm-up
+        point followed by enough iterations (see STAModel.run_model).
+        """
+        if steady_iterations is not None:
+            self.warmup_point = run_with_warmup_detection(
+                self, num_iterations, steady_iterations, check_interval)
+            return
+        super().run_model(num_iterations)
+
+    def get_average_completion_rate(self):
+        """Calculate average tasks completed per iteration."""
+        if self.completion_stats.iterations == 0:
+            return 0
+        if self.tasks_completed_per_iteration is None:
+            return self.tasks_completed / self.completion_stats.iterations
+        return np.mean(self.tasks_completed_per_iteration)
+
+    def get_steady_state_rate(self):
+        """Get (mean, std) of tasks completed per iteration after the warm-up."""
+        return (float(self.completion_stats.mean),
+                float(self.completion_stats.std()))
+
+    def get_completion_rate_over_time(self):
+        """Get the task completion rate over time."""
+        if self.tasks_completed_per_iteration is None:
+            raise ValueError("Model was created with store_series=False; "
+                             "use get_steady_state_rate() instead")
+        return self.tasks_completed_per_iteration
+
+
+def run_replicas(num_replicas, num_iterations, seed=None, **params):
+    """Simulate independent replicas of one configuration in a single batch.
+
+    ``params`` are the STAModel constructor parameters. Returns the
+    (replicas, iterations) matrix of tasks completed per iteration.
+    """
+    model = BatchedSTAModel(num_replicas=num_replicas, seed=seed, **params)
+    model.run_model(num_iterations)
+    return model.get_completion_rate_over_time()
@@ -0,0 +1,16 @@
+# simulation/__init__.py
+from .runner import (PROTOCOLS, expand_grid, run_sweep, run_configs, collect,
+                     merge_latency)
+from .cache import ResultCache, models_fingerprint
+from .planner import effective_params, plan
+from .replication import (confidence_interval, run_until_precise,
+                          paired_differences)
+from .steady_state import rolling_cv, steady_state_index
+from .batch_means import batch_means, run_batch_means, compare_with_replications
+
+__all__ = ['PROTOCOLS', 'expand_grid', 'run_sweep', 'run_configs', 'collect',
+           'merge_latency', 'ResultCache', 'models_fingerprint',
+           'effective_params', 'plan',
+           'confidence_interval', 'run_until_precise', 'paired_differences',
+           'rolling_cv', 'steady_state_index', 'batch_means', 'run_batch_means',
+           'compare_with_replications']
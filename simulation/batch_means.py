@@ -0,0 +1,147 @@
+import time
+
+import numpy as np
+from scipy import stats
+
+from .planner import effective_params, plan
+from .replication import confidence_interval, relative_error
+from .runner import (ENGINES, common_random_params, completion_series,
+                     expand_grid, model_params, run_configs, run_jobs)
+
+
+def lag1_autocorrelation(values):
+    """Lag-1 autocorrelation of a 1-D series (0 for a constant series)."""
+    values = np.asarray(values, dtype=float)
+    centred = values - values.mean()
+    denominator = np.dot(centred, centred)
+    if denominator == 0:
+        return 0.0
+    return float(np.dot(centred[:-1], centred[1:]) / denominator)
+
+
+def batch_means(series, num_batches=20, confidence=0.95, min_batches=10):
+    """Batch-means estimate of the steady-state mean of one long series.
+
+    The series is split into ``num_batches`` equal batches (a remainder at
+    the start is dropped). While the lag-1 autocorrelation of the batch
+    means is significant at the 5% level, adjacent batches are merged,
+    halving their number, down to ``min_batches``. The Student-t interval
+    is then computed from the batch means as if they were independent runs.
+    """
+    values = np.asarray(series, dtype=float)
+    num_batches = min(num_batches, len(values))
+    while True:
+        batch_size = len(values) // num_batches
+        used = values[len(values) - num_batches * batch_size:]
+        means = used.reshape(num_batches, batch_size).mean(axis=1)
+        autocorrelation = lag1_autocorrelation(means)
+        uncorrelated = abs(autocorrelation) <= stats.norm.ppf(0.975) / np.sqrt(num_batches)
+        if uncorrelated or num_batches // 2 < min_batches:
+            break
+        num_batches //= 2
+
+    mean, half_width = confidence_interval(means, confidence)
+    return {
+        'mean_rate': mean,
+        'ci_half_width': half_width,
+        'relative_error': relative_error(mean, half_width),
+        'num_batches': num_batches,
+        'batch_size': batch_size,
+        'lag1_autocorrelation': autocorrelation,
+        'uncorrelated': bool(uncorrelated),
+    }
+
+
+def run_long_simulation(job):
+    """Run (or load) one long trajectory and return its batch-means summary."""
+    (params, seed, num_iterations, warmup_iterations, engine, cache_dir,
+     num_batches, confidence) = job
+    start = time.perf_counter()
+    rates, cached = completion_series(ENGINES[engine], dict(params), seed,
+                                      num_iterations, cache_dir)
+    summary = batch_means(rates[warmup_iterations:], num_batches, confidence)
+    summary.update({
+        'iterations': num_iterations,
+        'runtime': time.perf_counter() - start,
+        'cached': cached,
+    })
+    return summary
+
+
+def run_batch_means(grid, seed, num_iterations, warmup_iterations=0,
+                    base_params=None, num_batches=20, confidence=0.95,
+                    engine='mesa', max_workers=None, chunksize=None,
+                    cache_dir=None, common_random_numbers=False):
+    """Estimate every configuration of a grid from one long warmed-up run each.
+
+    Each configuration pays for its warm-up once and is summarised with
+    batch_means. As in run_sweep, equivalent configurations share one run,
+    the rest run in parallel and common_random_numbers selects the
+    counter-based RNG. Returns one dict per configuration, in grid order.
+    """
+    base_params = base_params or {}
+    if common_random_numbers:
+        base_params = common_random_params(base_params, engine)
+    configs = [{**base_params, **config} for config in expand_grid(grid)]
+    requested = [(tuple(sorted(effective_params(ENGINES[engine], model_params(config)).items())),
+                  seed, num_iterations, warmup_iterations, engine, cache_dir,
+                  num_batches, confidence)
+                 for config in configs]
+    jobs, index = plan(requested)
+    summaries = run_jobs(run_long_simulation, jobs, max_workers, chunksize)
+
+    rows = []
+    for config, job in zip(configs, index):
+        row = dict(config)
+        row['seed'] = seed
+        row.update(summaries[job])
+        rows.append(row)
+    return rows
+
+
+def compare_with_replications(grid, first_seed, num_runs, num_iterations,
+                              warmup_iterations, base_params=None,
+                              num_batches=20, confidence=0.95, **sweep_options):
+    """Check batch-means estimates against the replication estimates we publish.
+
+    Replications are ``num_runs`` runs of ``num_iterations`` with the first
+    ``warmup_iterations`` discarded. The long run keeps the same number of
+    post-warm-up iterations but warms up once, so it simulates
+    warmup + num_runs * (num_iterations - warmup) iterations. Returns one
+    dict per configuration with both estimates, their iteration costs and
+    whether they 'agree' (difference within the combined CI half-widths).
+    ``sweep_options`` go to run_configs; those run_batch_means shares with
+    it (engine, workers, cache, common random numbers) go to the long runs.
+    """
+    seeds = [first_seed + run for run in range(num_runs)]
+    configs = expand_grid(grid)
+    replication_rows = run_configs(configs, seeds, num_iterations,
+                                   warmup_iterations, base_params,
+                                   **sweep_options)
+    long_iterations = warmup_iterations + num_runs * (num_iterations - warmup_iterations)
+    long_options = {name: value for name, value in sweep_options.items()
+                    if name not in ('record_latency', 'record_operations')}
+    long_rows = run_batch_means(grid, first_seed, long_iterations,
+                                warmup_iterations, base_params, num_batches,
+                                confidence, **long_options)
+
+    comparison = []
+    for position, (config, long_row) in enumerate(zip(configs, long_rows)):
+        rates = [row['mean_rate']
+                 for row in replication_rows[position * num_runs:(position + 1) * num_runs]]
+        mean, half_width = confidence_interval(rates, confidence)
+        difference = long_row['mean_rate'] - mean
+        row = dict(config)
+        row.update({
+            'replication_mean': mean,
+            'replication_half_width': half_width,
+            'replication_iterations': num_runs * num_iterations,
+            'batch_means_mean': long_row['mean_rate'],
+            'batch_means_half_width': long_row['ci_half_width'],
+            'batch_means_iterations': long_iterations,
+            'batches_uncorrelated': long_row['uncorrelated'],
+            'difference': difference,
+            'agree': bool(abs(difference) <= np.hypot(half_width, long_row['ci_half_width'])),
+        })
+        comparison.append(row)
+    return comparison
@@ -0,0 +1,67 @@
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+MODELS_DIR = Path(__file__).resolve().parent.parent / 'models'
+
+_fingerprint = None
+
+
+def models_fingerprint():
+    """Hash of every source file in models/, so results go stale when the model changes."""
+    global _fingerprint
+    if _fingerprint is None:
+        digest = hashlib.sha256()
+        for path in sorted(MODELS_DIR.glob('*.py')):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+        _fingerprint = digest.hexdigest()
+    return _fingerprint
+
+
+class ResultCache:
+    """Content-addressed on-disk store of completion series.
+
+    Each entry is keyed by a hash of the engine, every constructor argument
+    (defaults filled in), the seed, the iteration count and the models/
+    fingerprint, and is stored as a .npy file named after that hash.
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, model_class, params, seed, num_iterations):
+        """Return the cache key for one simulation."""
+        arguments = inspect.signature(model_class).bind(seed=seed, **params)
+        arguments.apply_defaults()
+        description = {
+            'engine': model_class.__name__,
+            'arguments': dict(arguments.arguments),
+            'num_iterations': num_iterations,
+            'models': models_fingerprint(),
+        }
+        encoded = json.dumps(description, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode()).hexdigest()
+
+    def path(self, key):
+        return self.directory / f'{key}.npy'
+
+    def load(self, key):
+        """Return the stored completion series, or None on a miss."""
+        try:
+            return np.load(self.path(key))
+        except (FileNotFoundError, ValueError, EOFError):
+            return None
+
+    def store(self, key, rates):
+        """Write a completion series atomically (workers may race on the same key)."""
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as handle:
+            np.save(handle, np.asarray(rates))
+        os.replace(tmp, self.path(key))
@@ -0,0 +1,52 @@
+import inspect
+
+
+def effective_params(model_class, params):
+    """Normalise constructor arguments to the behaviour they actually produce.
+
+    Every argument is filled in from the constructor defaults, then settings
+    that cannot influence a run are reset so that equivalent configurations
+    compare equal:
+
+    - without recruitment (Rd <= 0, or neither call-out nor auction) the
+      model is plain random search, so all protocol flags, Rd and Rt go
+      back to their defaults;
+    - call-off does nothing without call-out signalling;
+    - under auction, call-out flags matter only for call-off.
+    """
+    signature = inspect.signature(model_class)
+    arguments = signature.bind_partial(**params)
+    arguments.apply_defaults()
+    effective = dict(arguments.arguments)
+    effective.pop('seed', None)
+
+    recruits = (effective['communication_range'] > 0
+                and (effective['use_auction'] or effective['use_communication']))
+    if not recruits:
+        for name in ('communication_range', 'response_duration',
+                     'use_communication', 'use_calloff', 'use_auction'):
+            effective[name] = signature.parameters[name].default
+        return effective
+
+    if not effective['use_communication']:
+        effective['use_calloff'] = False
+    if effective['use_auction'] and not effective['use_calloff']:
+        effective['use_communication'] = False
+    return effective
+
+
+def plan(jobs):
+    """Collapse jobs that would run identical simulations.
+
+    ``jobs`` are hashable job keys. Returns (unique jobs in first-seen order,
+    index into the unique list for every input job).
+    """
+    positions = {}
+    unique = []
+    index = []
+    for job in jobs:
+        if job not in positions:
+            positions[job] = len(unique)
+            unique.append(job)
+        index.append(positions[job])
+    return unique, index
@@ -0,0 +1,119 @@
+import numpy as np
+from scipy import stats
+
+from .runner import expand_grid, run_configs
+
+
+def confidence_interval(data, confidence=0.95):
+    """Return (mean, half-width) of the Student-t interval for the mean of data."""
+    data = np.asarray(data, dtype=float)
+    mean = float(np.mean(data))
+    if len(data) < 2:
+        return mean, float('inf')
+    t_stat = stats.t.ppf((1 + confidence) / 2, len(data) - 1)
+    return mean, float(t_stat * np.std(data, ddof=1) / np.sqrt(len(data)))
+
+
+def relative_error(mean, half_width):
+    """Half-width relative to the mean (inf when the mean is not positive)."""
+    return half_width / mean if mean > 0 else float('inf')
+
+
+def run_until_precise(grid, first_seed, num_iterations, warmup_iterations=0,
+                      base_params=None, target_relative_error=0.05,
+                      confidence=0.95, batch_size=5, max_runs=100,
+                      **sweep_options):
+    """Add replications per configuration until its confidence interval is tight enough.
+
+    Seeds ``first_seed, first_seed + 1, ...`` are run in batches of
+    ``batch_size`` for every configuration still short of the target. After
+    each batch the Student-t interval of the per-run mean rates is
+    recomputed; a configuration stops as soon as its half-width is at most
+    ``target_relative_error`` times its mean, or when it reaches
+    ``max_runs``. Each batch of all still-active configurations is one
+    run_configs dispatch; ``sweep_options`` are passed through to it.
+
+    Returns one dict per configuration, in grid order, with the per-run
+    'rates', 'runs', 'mean_rate', 'ci_half_width', the achieved
+    'relative_error' and whether it 'converged'.
+    """
+    configs = expand_grid(grid)
+    rates = [[] for _ in configs]
+    active = list(range(len(configs)))
+    runs = 0
+    while active and runs < max_runs:
+        batch = min(batch_size, max_runs - runs)
+        seeds = [first_seed + runs + offset for offset in range(batch)]
+        rows = run_configs([configs[i] for i in active], seeds, num_iterations,
+                           warmup_iterations, base_params, **sweep_options)
+        for position, config_index in enumerate(active):
+            batch_rows = rows[position * batch:(position + 1) * batch]
+            rates[config_index].extend(row['mean_rate'] for row in batch_rows)
+        runs += batch
+
+        still_active = []
+        for config_index in active:
+            mean, half_width = confidence_interval(rates[config_index], confidence)
+            if relative_error(mean, half_width) > target_relative_error:
+                still_active.append(config_index)
+        active = still_active
+
+    results = []
+    for config, config_rates in zip(configs, rates):
+        mean, half_width = confidence_interval(config_rates, confidence)
+        error = relative_error(mean, half_width)
+        result = dict(config)
+        result.update({
+            'rates': config_rates,
+            'runs': len(config_rates),
+            'mean_rate': mean,
+            'ci_half_width': half_width,
+            'relative_error': error,
+            'converged': error <= target_relative_error,
+        })
+        results.append(result)
+    return results
+
+
+def paired_differences(rows, compare='protocol', baseline='random',
+                       by=('communication_range',), value='mean_rate',
+                       confidence=0.95):
+    """Per-seed differences of a result table against a baseline, with CIs.
+
+    Every row is paired with the baseline row (``compare`` column equal to
+    ``baseline``) that has the same ``by`` values and seed. Returns
+    {key tuple of by + compare values: summary} for each non-baseline
+    group, with the mean difference, its Student-t half-width, the number
+    of pairs and the 'variance_ratio' var(difference) / (var(a) + var(b)):
+    1 for independent runs, well below 1 when common random numbers pay off.
+    """
+    baseline_values = {}
+    for row in rows:
+        if row[compare] == baseline:
+            key = tuple(row[name] for name in by)
+            baseline_values[key + (row['seed'],)] = row[value]
+
+    pairs = {}
+    for row in rows:
+        if row[compare] == baseline:
+            continue
+        key = tuple(row[name] for name in by)
+        base = baseline_values.get(key + (row['seed'],))
+        if base is not None:
+            pairs.setdefault(key + (row[compare],), []).append((row[value], base))
+
+    results = {}
+    for key, values in pairs.items():
+        values = np.asarray(values, dtype=float)
+        differences = values[:, 0] - values[:, 1]
+        mean, half_width = confidence_interval(differences, confidence)
+        independent = np.var(values[:, 0], ddof=1) + np.var(values[:, 1], ddof=1) \
+            if len(values) > 1 else 0.0
+        results[key] = {
+            'mean_difference': mean,
+            'ci_half_width': half_width,
+            'pairs': len(values),
+            'variance_ratio': (float(np.var(differences, ddof=1) / independent)
+                               if independent > 0 else float('nan')),
+        }
+    return results
@@ -0,0 +1,225 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from models.sta_model import STAModel
+from models.vectorized_model import VectorizedSTAModel
+from models.profiling import LatencyHistogram
+
+from .cache import ResultCache
+from .planner import effective_params, plan
+
+# Protocol name -> STAModel flags. Random search never communicates, so it
+# also forces communication_range=0 (as in part2b).
+PROTOCOLS = {
+    'random': {'use_communication': False, 'use_calloff': False,
+               'use_auction': False, 'communication_range': 0},
+    'callout': {'use_communication': True, 'use_calloff': False,
+                'use_auction': False},
+    'calloff': {'use_communication': True, 'use_calloff': True,
+                'use_auction': False},
+    'auction': {'use_communication': False, 'use_calloff': False,
+                'use_auction': True},
+}
+
+ENGINES = {
+    'mesa': STAModel,
+    'vectorized': VectorizedSTAModel,
+}
+
+
+def expand_grid(grid):
+    """Expand {name: [values]} into a list of parameter dicts (cartesian product)."""
+    names = list(grid)
+    return [dict(zip(names, values))
+            for values in itertools.product(*(grid[name] for name in names))]
+
+
+def model_params(config):
+    """Translate a sweep configuration into STAModel constructor arguments.
+
+    A 'protocol' entry is replaced by the flags from PROTOCOLS; protocol
+    flags override any conflicting explicit values.
+    """
+    params = dict(config)
+    protocol = params.pop('protocol', None)
+    if protocol is not None:
+        params.update(PROTOCOLS[protocol])
+    return params
+
+
+def completion_series(model_class, params, seed, num_iterations, cache_dir=None):
+    """Return (completion series, whether it came from the cache) for one run."""
+    cache = key = None
+    if cache_dir is not None:
+        cache = ResultCache(cache_dir)
+        key = cache.key(model_class, params, seed, num_iterations)
+        rates = cache.load(key)
+        if rates is not None:
+            return rates, True
+    model = model_class(seed=seed, **params)
+    model.run_model(num_iterations)
+    rates = np.asarray(model.get_completion_rate_over_time())
+    if cache is not None:
+        cache.store(key, rates)
+    return rates, False
+
+
+def run_simulation(job):
+    """Run one (parameters, seed) job and return its summary statistics.
+
+    Runs in a worker process, so only plain summary values are returned,
+    never the model itself. Parameters arrive as a sorted tuple of
+    (name, value) pairs so jobs can be deduplicated.
+    """
+    (params, seed, num_iterations, warmup_iterations, engine, cache_dir,
+     record_latency, record_operations) = job
+    start = time.perf_counter()
+    model = None
+    if record_latency or record_operations:
+        # Instrumentation lives on the model, so these runs skip the cache
+        model = ENGINES[engine](seed=seed, **{**dict(params),
+                                             'record_latency': record_latency})
+        model.run_model(num_iterations)
+        rates, cached = np.asarray(model.get_completion_rate_over_time()), False
+    else:
+        rates, cached = completion_series(ENGINES[engine], dict(params), seed,
+                                          num_iterations, cache_dir)
+    steady_data = rates[warmup_iterations:]
+
+    summary = {
+        'mean_rate': float(np.mean(steady_data)),
+        'std_rate': float(np.std(steady_data)),
+        'tasks_completed': int(rates.sum()),
+        'iterations': num_iterations,
+        'runtime': time.perf_counter() - start,
+        'cached': cached,
+    }
+    if record_latency:
+        summary['latency'] = model.step_latency
+    if record_operations:
+        summary.update(model.get_operation_counts())
+    return summary
+
+
+def run_sweep(grid, seeds, num_iterations, warmup_iterations=0,
+              base_params=None, engine='mesa', max_workers=None,
+              chunksize=None, cache_dir=None, record_latency=False,
+              record_operations=False, common_random_numbers=False):
+    """Run every (configuration, seed) pair of a parameter grid over a process pool.
+
+    ``grid`` maps parameter names (STAModel arguments or 'protocol') to lists
+    of values; ``base_params`` holds the fixed parameters. Returns a tidy
+    table: one dict per run with the configuration, the seed and the
+    post-warm-up summary statistics, in grid order then seed order.
+    ``max_workers=1`` runs everything in-process. With ``cache_dir`` set,
+    completion series are read from / written to a ResultCache there, so
+    only configurations not simulated before (or simulated with different
+    models/ source) are actually run.
+
+    Configurations are first normalised to their effective behaviour (see
+    planner.effective_params), so e.g. random search at every Rd, or any
+    protocol at Rd=0, is simulated once per seed and its summary shared by
+    every row that asked for it.
+
+    With ``record_latency`` (STAModel engine only), each row also carries a
+    'latency' LatencyHistogram of per-step wall time from its own run of
+    the configuration as given (no sharing between equivalent rows);
+    combine them with merge_latency. With ``record_operations`` (STAModel only), each row
+    also has the model's operation counts (distance evaluations, signals,
+    auctions, call-offs, respawns). Both options bypass the cache, and
+    any other engine raises ValueError.
+
+    With ``common_random_numbers`` (STAModel only), every run uses
+    rng="counter": each agent's walk draws are addressed by (seed, step,
+    agent) and task positions by (seed, slot, spawn), so configurations
+    sharing a seed see the same randomness wherever their trajectories
+    agree. Compare them per seed with paired_differences.
+    """
+    return run_configs(expand_grid(grid), seeds, num_iterations,
+                       warmup_iterations, base_params, engine, max_workers,
+                       chunksize, cache_dir, record_latency, record_operations,
+                       common_random_numbers)
+
+
+def common_random_params(base_params, engine):
+    """base_params switched to the counter-based RNG that common random numbers use."""
+    if engine != 'mesa':
+        raise ValueError("common_random_numbers needs the 'mesa' engine")
+    return {**base_params, 'rng': 'counter'}
+
+
+def run_configs(configs, seeds, num_iterations, warmup_iterations=0,
+                base_params=None, engine='mesa', max_workers=None,
+                chunksize=None, cache_dir=None, record_latency=False,
+                record_operations=False, common_random_numbers=False):
+    """Run every seed of an explicit list of configurations; see run_sweep."""
+    base_params = base_params or {}
+    if common_random_numbers:
+        base_params = common_random_params(base_params, engine)
+    if (record_latency or record_operations) and engine != 'mesa':
+        raise ValueError("record_latency and record_operations need the 'mesa' engine")
+    model_class = ENGINES[engine]
+    runs = [({**base_params, **config}, seed)
+            for config in configs for seed in seeds]
+    requested = []
+    for config, seed in runs:
+        params = model_params(config)
+        if not record_latency:
+            params = effective_params(model_class, params)
+        requested.append((tuple(sorted(params.items())), seed, num_iterations,
+                          warmup_iterations, engine, cache_dir,
+                          record_latency, record_operations))
+    if record_latency:
+        # Timings belong to the configuration as given, one run per row
+        jobs, index = requested, list(range(len(requested)))
+    else:
+        jobs, index = plan(requested)
+
+    summaries = run_jobs(run_simulation, jobs, max_workers, chunksize)
+
+    rows = []
+    for (config, seed), job in zip(runs, index):
+        row = dict(config)
+        row['seed'] = seed
+        row.update(summaries[job])
+        rows.append(row)
+    return rows
+
+
+def run_jobs(function, jobs, max_workers=None, chunksize=None):
+    """Map a module-level function over jobs in-process or over a process pool, preserving order."""
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1 or len(jobs) <= 1:
+        return [function(job) for job in jobs]
+
+    # A few chunks per worker balances load without per-job IPC overhead
+    if chunksize is None:
+        chunksize = max(1, len(jobs) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(function, jobs, chunksize=chunksize))
+
+
+def merge_latency(rows, by=()):
+    """Merge the per-run latency histograms of a result table.
+
+    Returns one LatencyHistogram per group when ``by`` names columns, as
+    {key tuple: histogram}, or a single histogram over all rows otherwise.
+    """
+    if not by:
+        return LatencyHistogram.merged(row['latency'] for row in rows)
+    grouped = collect(rows, by, value='latency')
+    return {key: LatencyHistogram.merged(histograms)
+            for key, histograms in grouped.items()}
+
+
+def collect(rows, by, value='mean_rate'):
+    """Group a result table into {key tuple: [values]} keeping run order."""
+    grouped = {}
+    for row in rows:
+        key = tuple(row[name] for name in by)
+        grouped.setdefault(key, []).append(row[value])
+    return grouped
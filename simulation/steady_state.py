@@ -0,0 +1,75 @@
+import numpy as np
+
+
+def _window_sums(values, width):
+    """Sums of every length-``width`` window along the last axis, via cumulative sums."""
+    totals = np.cumsum(values, axis=-1)
+    totals = np.concatenate([np.zeros(values.shape[:-1] + (1,)), totals], axis=-1)
+    return totals[..., width:] - totals[..., :-width]
+
+
+def rolling_cv(completion_rates, window_size=50):
+    """Coefficient of variation of every centred 2*window_size window.
+
+    ``completion_rates`` is a (runs, iterations) array. Window ``j`` covers
+    iterations [j, j + 2*window_size), i.e. it is centred on iteration
+    ``j + window_size``. Returns (cv, valid), where ``valid`` is False for
+    windows with a zero mean (cv is set to 0 there).
+    """
+    rates = np.asarray(completion_rates, dtype=float)
+    width = 2 * window_size
+    mean = _window_sums(rates, width) / width
+    mean_square = _window_sums(rates * rates, width) / width
+    variance = np.maximum(mean_square - mean * mean, 0)
+    valid = mean > 0
+    cv = np.divide(np.sqrt(variance), mean, out=np.zeros_like(mean), where=valid)
+    return cv, valid
+
+
+def steady_state_index(completion_rates, window_size=50, smooth_window=20,
+                       lookback=50, threshold=0.001, min_points=100):
+    """Iteration at which each run's rolling coefficient of variation stabilises.
+
+    Array version of the original part1d analysis: the rolling CV of the
+    non-empty windows is smoothed with a ``smooth_window`` moving average,
+    and steady state is the first point where the mean absolute change of
+    the smoothed CV over the previous ``lookback`` points drops below
+    ``threshold``. Runs with no such point get half their length; series
+    shorter than two windows get their full length.
+
+    Accepts one series or a (runs, iterations) matrix and returns an int or
+    an array of per-run indices accordingly. Every stage uses cumulative
+    sums, so the cost is O(iterations) per run.
+    """
+    rates = np.asarray(completion_rates, dtype=float)
+    single = rates.ndim == 1
+    rates = np.atleast_2d(rates)
+    runs, num_iterations = rates.shape
+
+    result = np.full(runs, num_iterations // 2, dtype=np.int64)
+    if num_iterations < 2 * window_size:
+        result[:] = num_iterations
+        return int(result[0]) if single else result
+
+    cv, valid = rolling_cv(rates, window_size)
+    # The original loop stops one window short of the end (centres up to
+    # n - window_size - 1); drop that window so the counts match
+    cv, valid = cv[:, :-1], valid[:, :-1]
+    # Zero-mean windows are skipped, so pack each run's valid CVs to the front
+    order = np.argsort(~valid, axis=1, kind='stable')
+    cv = np.take_along_axis(cv, order, axis=1)
+    lengths = valid.sum(axis=1)
+
+    if cv.shape[1] - smooth_window > lookback:
+        smooth = _window_sums(cv, smooth_window) / smooth_window
+        derivative = np.abs(np.diff(smooth, axis=1))
+        ends = np.arange(lookback, derivative.shape[1])
+        recent = _window_sums(derivative, lookback)[:, :ends.size] / lookback
+
+        # derivative[k] only uses packed CVs when k < length - smooth_window
+        usable = ends[None, :] < (lengths - smooth_window)[:, None]
+        settled = (recent < threshold) & usable & (lengths > min_points)[:, None]
+        found = settled.any(axis=1)
+        result[found] = ends[settled[found].argmax(axis=1)] + window_size
+
+    return int(result[0]) if single else result